@@ -1,10 +1,127 @@
+import asyncio
+import hashlib
 import json
+import sqlite3
 import time
 import logging
 import math
-from typing import Dict, Any, List, Optional
+import random
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
 from google import genai
 
+try:
+    import orjson  # Optional: schnelleres JSON-Parsing
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Gültige Stufen der Text-Metriken (Reihenfolge bestimmt Tie-Break)
+_METRIC_LEVELS = ('low', 'medium', 'high')
+_VALID_METRIC_LEVELS = frozenset(_METRIC_LEVELS)
+
+# Dekodiert das erste JSON-Objekt und ignoriert nachfolgenden Text
+_JSON_DECODER = json.JSONDecoder()
+
+# Satzgrenzen für das Chunking (Whitespace nach Satzzeichen)
+_SENT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Statische Prompt-Bausteine. Bewusst keine f-Strings, da der JSON-Block
+# literale geschweifte Klammern enthält.
+_PROMPT_PREFIX = """Du bist ein spezialisierter KI-Detektor für akademische Texte mit Expertise in der Erkennung maschinell generierter vs. menschlich verfasster wissenschaftlicher Arbeiten.
+
+AUFGABE: Analysiere den folgenden Textabschnitt und klassifiziere ihn als KI-generiert oder menschlich verfasst.
+
+ANALYSIERE FOLGENDE INDIKATOREN:
+1. Satzlängenverteilung: Uniforme Längen (KI-typisch) vs. natürliche Variation (menschlich)
+2. Transition Words: Übermäßiger Gebrauch von "darüber hinaus", "zusammenfassend", "furthermore", "however"
+3. Strukturierung: Formelhafte Organisation vs. natürlicher Gedankenfluss
+4. Fehlerpattern: Fehlen typischer menschlicher Inkonsistenzen oder Schreibfehler
+5. Argumentation: Perfekte Konsistenz (KI) vs. menschliche Gedankensprünge
+6. AI-Phrasen: Typische Konstruktionen wie "es ist wichtig zu beachten", "in diesem Zusammenhang"
+7. Emotionalität: Neutrale Sachlichkeit (KI) vs. persönlicher Ausdruck (menschlich)
+"""
+
+_UNICODE_BLOCK_TEMPLATE = (
+    "\nZUSÄTZLICHE INFORMATION - UNSICHTBARE ZEICHEN ERKANNT:\n"
+    "Der Text enthält {count} unsichtbare Unicode-Zeichen:\n"
+    "{dump}\n\n"
+    "Dies ist ein STARKER Indikator für KI-Generierung (Wasserzeichen-System).\n"
+    "Gewichte diese Information hoch in deiner Analyse.\n"
+)
+
+_PROMPT_SUFFIX = """\nANTWORTE AUSSCHLIESSLICH im folgenden JSON-Format (keine zusätzlichen Kommentare):
+{
+    "confidence_score": "0.0-1.0",
+    "is_ai_generated": true/false,
+    "ai_probability": "0.0-1.0",
+    "human_probability": "0.0-1.0",
+    "reasoning": "Detaillierte Begründung der Klassifikation in 2-3 Sätzen",
+    "specific_indicators": ["Liste der erkannten Indikatoren"],
+    "suspicious_phrases": ["Verdächtige Phrasen falls gefunden"],
+    "text_metrics": {
+        "sentence_uniformity": "low/medium/high",
+        "vocabulary_complexity": "low/medium/high",
+        "emotional_expression": "low/medium/high"
+    }
+}
+\nZU ANALYSIERENDER TEXT:\n"""
+
+# Lokaler Response-Cache; enthält Begründungen und zitierte Phrasen aus den PDFs
+RESPONSE_CACHE_PATH = Path.home() / ".aiscanner" / "gemini_cache.sqlite3"
+
+def clear_response_cache(cache_path: Path = RESPONSE_CACHE_PATH) -> bool:
+    """Löscht die Cache-Datenbank (True, falls eine Datei entfernt wurde)"""
+    try:
+        cache_path.unlink()
+    except FileNotFoundError:
+        return False
+    return True
+
+@lru_cache(maxsize=32)
+def _format_unicode_block(count: int, found_items: Tuple[Tuple[str, int], ...]) -> str:
+    """Formatiert den Unicode-Hinweis (gecacht, da pro Dokument identisch)"""
+    return _UNICODE_BLOCK_TEMPLATE.format(
+        count=count,
+        dump=json.dumps(dict(found_items), ensure_ascii=False)  # kompakt: weniger Tokens
+    )
+
+class ChunkSummary(NamedTuple):
+    """Kompakte Projektion eines Chunk-Ergebnisses (nur aggregierte Felder)"""
+    confidence_score: float
+    ai_probability: float
+    specific_indicators: Tuple[Any, ...]
+    suspicious_phrases: Tuple[Any, ...]
+    reasoning: str
+    sentence_uniformity: str
+    vocabulary_complexity: str
+    emotional_expression: str
+    
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> 'ChunkSummary':
+        """Projiziert geparstes Chunk-Ergebnis auf die benötigten Felder"""
+        indicators = result.get('specific_indicators', [])
+        phrases = result.get('suspicious_phrases', [])
+        text_metrics = result.get('text_metrics', {})
+        if not isinstance(text_metrics, dict):
+            text_metrics = {}
+        
+        return cls(
+            confidence_score=result.get('confidence_score', 0.0),
+            ai_probability=result.get('ai_probability', 0.5),
+            specific_indicators=tuple(indicators) if isinstance(indicators, list) else (),
+            suspicious_phrases=tuple(phrases) if isinstance(phrases, list) else (),
+            reasoning=result.get('reasoning') or '',
+            sentence_uniformity=text_metrics.get('sentence_uniformity', 'medium'),
+            vocabulary_complexity=text_metrics.get('vocabulary_complexity', 'medium'),
+            emotional_expression=text_metrics.get('emotional_expression', 'medium')
+        )
+
 class GeminiAnalyzer:
     """
     Erweiterte Gemini API Integration für KI-Texterkennung
@@ -17,11 +134,29 @@ class GeminiAnalyzer:
         
         # Konfiguration
         self.chunk_size = 8000      # Zeichen pro Chunk
-        self.chunk_overlap = 200    # Overlap zwischen Chunks
+        self.chunk_overlap = 200    # Max. Overlap (letzter Satz) zwischen Chunks
         self.max_retries = 3
         self.retry_delay_base = 2
+        self.max_retry_after = 30           # Sekunden; Obergrenze für Retry-After des Servers
+        self.max_concurrent_requests = 5    # Parallele API-Calls (Rate-Limit)
+        self.max_indicators = 10            # Aggregierte Indikatoren
+        self.max_suspicious_phrases = 5     # Aggregierte verdächtige Phrasen
+        self.early_exit_enabled = False     # Opt-in: Analyse bei stabilem Ergebnis vorzeitig beenden
+        self.early_exit_min_chunks = 3      # Frühestens nach n abgeschlossenen Chunks abbrechen
+        self.early_exit_std_error = 0.02    # Abbruch, wenn Standardfehler darunter liegt
+        self.early_exit_min_confidence = 0.9    # Mindest-Confidence im Mittel (Fehlschläge zählen als 0)
+        self.early_exit_decisive_margin = 0.05  # Mittelwert muss < margin oder > 1 - margin sein
         self.model_name = "gemini-2.0-flash"
         
+        # Persistenter Response-Cache (Prompt-Hash → geparstes Ergebnis, inkl. zitierter Phrasen)
+        self.cache_enabled = True           # False: weder lesen noch schreiben
+        self.cache_path = RESPONSE_CACHE_PATH
+        self.cache_ttl = 30 * 86400         # Sekunden
+        self._cache_evicted = False
+        
+        # Eigener Event-Loop, damit der async Client nicht über geschlossene Loops hinweg genutzt wird
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
         self._initialize_client()
     
     def _initialize_client(self):
@@ -34,13 +169,41 @@ class GeminiAnalyzer:
             self.logger.error("❌ %s", error_msg)
             raise ValueError(error_msg)
     
-    def test_connection(self) -> Dict[str, Any]:
-        """Testet die API-Verbindung"""
+    def _run_coroutine(self, coro):
+        """Führt eine Coroutine synchron auf dem Analyzer-eigenen Event-Loop aus"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self._run_on_own_loop(coro)
+        
+        # Aufruf aus einem laufenden Event-Loop (z.B. Jupyter): in Worker-Thread ausweichen
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(self._run_on_own_loop, coro).result()
+    
+    def _run_on_own_loop(self, coro):
+        """Führt Coroutine auf dem eigenen Loop aus (nie parallel aufrufen)"""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+    
+    def test_connection(self, deep: bool = False) -> Dict[str, Any]:
+        """
+        Testet die API-Verbindung
+        
+        Args:
+            deep: Vollständige Test-Analyse statt leichtgewichtigem count_tokens-Aufruf
+        """
         try:
-            test_text = "Dies ist ein Test-Text zur Überprüfung der API-Verbindung."
-            
             start_time = time.time()
-            result = self._analyze_single_chunk(test_text)
+            
+            if deep:
+                test_text = "Dies ist ein Test-Text zur Überprüfung der API-Verbindung."
+                result = self._run_coroutine(self._analyze_single_chunk(test_text, use_cache=False))
+            else:
+                # Token-Zählung prüft Key und Modell ohne Inferenz-Kosten
+                self._run_coroutine(self._make_robust_count_tokens_call("ping"))
+                result = {'success': True, 'is_ai_generated': 'n/a'}
+            
             end_time = time.time()
             
             if result.get('success'):
@@ -64,14 +227,36 @@ class GeminiAnalyzer:
                 'response_time': None
             }
     
-    def analyze_document(self, text: str, unicode_analysis: Dict = None, progress_callback=None) -> Dict[str, Any]:
+    def analyze_document(self, text: str, unicode_analysis: Dict = None, progress_callback=None,
+                         chunk_progress_callback=None) -> Dict[str, Any]:
         """
         Analysiert komplettes Dokument mit Chunk-basierter Verarbeitung
         
+        Synchroner Wrapper um analyze_document_async (für Worker-Threads).
+        
         Args:
             text: Zu analysierender Text
             unicode_analysis: Ergebnisse der Unicode-Analyse
             progress_callback: Callback für Progress-Updates
+            chunk_progress_callback: Callback(completed, total) für den Chunk-Fortschritt
+            
+        Returns:
+            Kombinierte Analyse-Ergebnisse
+        """
+        return self._run_coroutine(
+            self.analyze_document_async(text, unicode_analysis, progress_callback, chunk_progress_callback)
+        )
+    
+    async def analyze_document_async(self, text: str, unicode_analysis: Dict = None, progress_callback=None,
+                                     chunk_progress_callback=None) -> Dict[str, Any]:
+        """
+        Analysiert komplettes Dokument; Chunks werden parallel an die API gesendet
+        
+        Args:
+            text: Zu analysierender Text
+            unicode_analysis: Ergebnisse der Unicode-Analyse
+            progress_callback: Callback für Progress-Updates (wird im Event-Loop aufgerufen)
+            chunk_progress_callback: Callback(completed, total) für den Chunk-Fortschritt
             
         Returns:
             Kombinierte Analyse-Ergebnisse
@@ -84,13 +269,16 @@ class GeminiAnalyzer:
                 if progress_callback:
                     progress_callback("Analysiere Dokument...")
                 
-                result = self._analyze_single_chunk(text, unicode_analysis)
+                result = await self._analyze_single_chunk(text, unicode_analysis)
                 result['analysis_method'] = 'single_chunk'
+                if chunk_progress_callback:
+                    chunk_progress_callback(1, 1)
                 return result
             
             else:
                 # Langer Text - Chunk-basierte Analyse
-                return self._analyze_with_chunks(text, unicode_analysis, progress_callback)
+                return await self._analyze_with_chunks(text, unicode_analysis, progress_callback,
+                                                       chunk_progress_callback)
                 
         except Exception as e:
             error_msg = f"Dokument-Analyse fehlgeschlagen: {str(e)}"
@@ -102,37 +290,103 @@ class GeminiAnalyzer:
                 'is_ai_generated': False
             }
     
-    def _analyze_with_chunks(self, text: str, unicode_analysis: Dict = None, progress_callback=None) -> Dict[str, Any]:
-        """Chunk-basierte Analyse mit Overlap"""
+    def estimate_chunks(self, text: str) -> int:
+        """Anzahl der API-Calls, die analyze_document für diesen Text absetzt"""
+        if len(text) <= self.chunk_size:
+            return 1
+        return len(self._create_chunk_bounds(text))
+    
+    async def _analyze_with_chunks(self, text: str, unicode_analysis: Dict = None, progress_callback=None,
+                                   chunk_progress_callback=None) -> Dict[str, Any]:
+        """Chunk-basierte Analyse mit Overlap (parallele API-Calls)"""
         
-        # Erstelle überlappende Chunks
-        chunks = self._create_overlapping_chunks(text)
-        total_chunks = len(chunks)
+        # Berechne Chunk-Grenzen; Teilstrings werden erst bei Bedarf erzeugt
+        chunk_bounds = self._create_chunk_bounds(text)
+        total_chunks = len(chunk_bounds)
         
         self.logger.info("📄 Text in %d überlappende Chunks aufgeteilt", total_chunks)
         
-        chunk_results = []
+        # Log-Level einmal prüfen statt pro Chunk
+        log_info = self.logger.isEnabledFor(logging.INFO)
         
-        for i, chunk in enumerate(chunks):
-            if progress_callback:
-                progress_callback(f"Analysiere Chunk {i+1}/{total_chunks}...")
-            
-            self.logger.info("🔍 Analysiere Chunk %d/%d", i+1, total_chunks)
-            
-            try:
-                # Nur für ersten Chunk Unicode-Info übergeben
-                chunk_unicode_info = unicode_analysis if i == 0 else None
-                result = self._analyze_single_chunk(chunk, chunk_unicode_info)
+        # Begrenzt gleichzeitige Requests, um Rate-Limits einzuhalten
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        
+        async def analyze_chunk(index: int, start: int, end: int):
+            async with semaphore:
+                if log_info:
+                    self.logger.info("🔍 Analysiere Chunk %d/%d", index+1, total_chunks)
+                
+                try:
+                    chunk = text[start:end]
+                    # Nur für ersten Chunk Unicode-Info übergeben
+                    chunk_unicode_info = unicode_analysis if index == 0 else None
+                    return index, await self._analyze_single_chunk(chunk, chunk_unicode_info)
+                    
+                except Exception as e:
+                    self.logger.warning("⚠️ Chunk %d Fehler: %s", index+1, str(e))
+                    return index, None
+        
+        if progress_callback:
+            progress_callback(f"Analysiere {total_chunks} Chunks parallel...")
+        
+        # Ergebnisse in Chunk-Reihenfolge halten (erster Chunk liefert das Reasoning)
+        ordered_results: List[Optional[ChunkSummary]] = [None] * total_chunks
+        tasks = [asyncio.ensure_future(analyze_chunk(i, start, end)) for i, (start, end) in enumerate(chunk_bounds)]
+        
+        # Laufende Summen für sequentiellen Konvergenz-Test (Gewicht = Confidence)
+        successful = 0
+        sum_w = sum_wx = sum_wx2 = 0.0
+        early_exit = False
+        
+        try:
+            for completed, next_result in enumerate(asyncio.as_completed(tasks), 1):
+                index, result = await next_result
+                
+                if chunk_progress_callback:
+                    chunk_progress_callback(completed, total_chunks)
+                if progress_callback:
+                    progress_callback(f"Chunk {completed}/{total_chunks} analysiert...")
+                
+                if result is None:
+                    continue
                 
                 if result.get('success'):
-                    chunk_results.append(result)
+                    # Sofort projizieren: volle Response-Dicts werden nicht gehalten
+                    summary = ChunkSummary.from_result(result)
+                    ordered_results[index] = summary
+                    
+                    successful += 1
+                    sum_w += summary.confidence_score
+                    sum_wx += summary.confidence_score * summary.ai_probability
+                    sum_wx2 += summary.confidence_score * summary.ai_probability ** 2
                 else:
                     self.logger.warning("⚠️ Chunk %d Analyse fehlgeschlagen: %s", 
-                                      i+1, result.get('error', 'Unbekannt'))
-                    
-            except Exception as e:
-                self.logger.warning("⚠️ Chunk %d Fehler: %s", i+1, str(e))
-                continue
+                                      index+1, result.get('error', 'Unbekannt'))
+                    continue
+                
+                if (self.early_exit_enabled and completed < total_chunks
+                        and self._has_converged(completed, successful, sum_w, sum_wx, sum_wx2)):
+                    early_exit = True
+                    break
+        finally:
+            # Unfertige Tasks immer abbrechen (vorzeitiger Abbruch oder Fehler, z.B. im
+            # progress_callback) - sonst laufen sie beim nächsten Aufruf auf dem Loop weiter
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        if early_exit:
+            self.logger.info("⏩ Ergebnis nach %d/%d Chunks stabil - Rest übersprungen", completed, total_chunks)
+            # Übersprungene Chunks gelten als erledigt
+            if chunk_progress_callback:
+                chunk_progress_callback(total_chunks, total_chunks)
+            if progress_callback:
+                progress_callback(f"Ergebnis nach {completed}/{total_chunks} Chunks stabil - Rest übersprungen")
+        
+        chunk_results = [r for r in ordered_results if r is not None]
         
         if not chunk_results:
             return {
@@ -146,41 +400,115 @@ class GeminiAnalyzer:
         if progress_callback:
             progress_callback("Ergebnisse werden zusammengeführt...")
         
-        return self._aggregate_chunk_results(chunk_results, text)
+        aggregated = self._aggregate_chunk_results(chunk_results, text)
+        if early_exit:
+            aggregated['analysis_summary']['analysis_method'] = 'chunked_early_exit'
+        
+        return aggregated
     
-    def _create_overlapping_chunks(self, text: str) -> List[str]:
-        """Erstellt überlappende Text-Chunks"""
-        chunks = []
-        start = 0
-        
-        while start < len(text):
-            end = min(start + self.chunk_size, len(text))
-            chunk = text[start:end]
-            chunks.append(chunk)
+    def _has_converged(self, completed: int, n: int, sum_w: float, sum_wx: float, sum_wx2: float) -> bool:
+        """
+        Prüft, ob das Ergebnis eindeutig und stabil genug für einen vorzeitigen Abbruch ist
+        
+        Args:
+            completed: Abgeschlossene Chunks (inkl. fehlgeschlagener)
+            n: Erfolgreiche Chunks
+            sum_w, sum_wx, sum_wx2: Laufende Summen (Gewicht = Confidence)
+        """
+        if completed < self.early_exit_min_chunks or n < self.early_exit_min_chunks or sum_w <= 0:
+            return False
+        
+        # Nur bei hoher Sicherheit über alle abgeschlossenen Chunks
+        if sum_w / completed < self.early_exit_min_confidence:
+            return False
+        
+        # Nur bei eindeutigem Ergebnis (weit weg von 0.5)
+        mean = sum_wx / sum_w
+        margin = self.early_exit_decisive_margin
+        if margin <= mean <= 1.0 - margin:
+            return False
+        
+        variance = max(0.0, sum_wx2 / sum_w - mean ** 2)
+        std_error = math.sqrt(variance) / math.sqrt(n)
+        return std_error < self.early_exit_std_error
+    
+    def _create_chunk_bounds(self, text: str) -> List[Tuple[int, int]]:
+        """Berechnet (start, end)-Grenzen satzbasierter, überlappender Chunks"""
+        if not text:
+            return []
+        
+        # Satz-Spannen ohne trennenden Whitespace
+        sentences = []
+        sentence_start = 0
+        for match in _SENT_RE.finditer(text):
+            sentences.append((sentence_start, match.start()))
+            sentence_start = match.end()
+        if sentence_start < len(text):
+            sentences.append((sentence_start, len(text)))
+        
+        bounds = []
+        i = 0
+        while i < len(sentences):
+            chunk_start = sentences[i][0]
+            
+            # Sätze gierig packen, solange der Chunk <= chunk_size bleibt
+            j = i
+            while j + 1 < len(sentences) and sentences[j + 1][1] - chunk_start <= self.chunk_size:
+                j += 1
+            
+            if sentences[j][1] - chunk_start > self.chunk_size:
+                # Einzelner Satz länger als chunk_size - zeichenbasiert teilen
+                bounds.extend(self._create_window_bounds(*sentences[i]))
+                i += 1
+                continue
             
-            if end >= len(text):
+            bounds.append((chunk_start, sentences[j][1]))
+            if j + 1 >= len(sentences):
                 break
             
-            # Nächster Chunk beginnt mit Overlap
-            start = end - self.chunk_overlap
+            # Nächster Chunk beginnt mit dem letzten Satz als Overlap (falls kurz genug und der
+            # Folgesatz noch dazupasst - sonst entstünde ein Chunk, der ganz im vorigen liegt)
+            if (j > i and sentences[j][1] - sentences[j][0] <= self.chunk_overlap
+                    and sentences[j + 1][1] - sentences[j][0] <= self.chunk_size):
+                i = j
+            else:
+                i = j + 1
         
-        return chunks
+        return bounds
+    
+    def _create_window_bounds(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """Zeichenbasierte Fenster mit festem Overlap für den Bereich [start, end)"""
+        step = self.chunk_size - self.chunk_overlap
+        return [(window_start, min(window_start + self.chunk_size, end))
+                for window_start in range(start, max(end - self.chunk_overlap, start + 1), step)]
     
-    def _analyze_single_chunk(self, text: str, unicode_analysis: Dict = None) -> Dict[str, Any]:
+    async def _analyze_single_chunk(self, text: str, unicode_analysis: Dict = None, use_cache: bool = True) -> Dict[str, Any]:
         """Analysiert einzelnen Text-Chunk"""
+        # Aufrufer liefern bereits passend geschnittene Chunks (nur im Debug-Modus geprüft)
+        assert len(text) <= self.chunk_size, "Chunk länger als chunk_size"
+        
         try:
             # Erstelle optimierten Prompt
             prompt = self._create_analysis_prompt(text, unicode_analysis)
+            cache_key = self._get_cache_key(prompt)
             
-            # API-Call mit Retry-Logic
-            response = self._make_robust_api_call(prompt)
+            use_cache = use_cache and self.cache_enabled
+            result = self._cache_get(cache_key) if use_cache else None
+            cache_hit = result is not None
             
-            # Parse und validiere Response
-            result = self._parse_api_response(response.text)
+            if not cache_hit:
+                # API-Call mit Retry-Logic
+                response_text = await self._make_robust_api_call(prompt)
+                
+                # Parse und validiere Response
+                result = self._parse_api_response(response_text)
+                if use_cache:
+                    self._cache_set(cache_key, result)
             
             # Füge Metadaten hinzu
             result.update({
                 'success': True,
+                'cache_hit': cache_hit,
                 'text_length': len(text),
                 'analysis_timestamp': time.time(),
                 'model_used': self.model_name
@@ -196,109 +524,166 @@ class GeminiAnalyzer:
                 'is_ai_generated': False
             }
     
+    def _get_cache_key(self, prompt: str) -> str:
+        """Erstellt Cache-Key aus Modell und whitespace-normalisiertem Prompt"""
+        normalized_prompt = " ".join(prompt.split())
+        return hashlib.sha256(f"{self.model_name}\n{normalized_prompt}".encode('utf-8')).hexdigest()
+    
+    def _open_cache(self) -> sqlite3.Connection:
+        """Öffnet die Cache-Datenbank (eine Verbindung pro Zugriff, thread-sicher)"""
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.cache_path), timeout=5)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(hash TEXT PRIMARY KEY, response TEXT NOT NULL, ts INTEGER NOT NULL)"
+        )
+        return conn
+    
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Liest gecachtes Ergebnis (None bei Miss, Ablauf oder Cache-Fehler)"""
+        try:
+            with closing(self._open_cache()) as conn:
+                row = conn.execute(
+                    "SELECT response FROM responses WHERE hash = ? AND ts >= ?",
+                    (key, int(time.time() - self.cache_ttl))
+                ).fetchone()
+        except Exception as e:
+            self.logger.debug("Cache nicht lesbar: %s", str(e))
+            return None
+        
+        if not row:
+            return None
+        
+        self.logger.debug("Cache-Treffer für %s", key[:12])
+        return json.loads(row[0])
+    
+    def _cache_set(self, key: str, result: Dict[str, Any]):
+        """Speichert geparstes Ergebnis im Cache (Fehler werden ignoriert)"""
+        try:
+            now = int(time.time())
+            with closing(self._open_cache()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (hash, response, ts) VALUES (?, ?, ?)",
+                    (key, json.dumps(result, ensure_ascii=False), now)
+                )
+                
+                # Abgelaufene Einträge einmal pro Analyzer entfernen
+                if not self._cache_evicted:
+                    conn.execute("DELETE FROM responses WHERE ts < ?", (now - self.cache_ttl,))
+                    self._cache_evicted = True
+        except Exception as e:
+            self.logger.debug("Cache nicht schreibbar: %s", str(e))
+    
+    @staticmethod
+    def _has_unicode_block(unicode_analysis: Optional[Dict]) -> bool:
+        """Ob der Prompt einen Unicode-Hinweis enthält"""
+        return bool(unicode_analysis) and unicode_analysis.get('total_invisible_count', 0) > 0
+    
     def _create_analysis_prompt(self, text: str, unicode_analysis: Dict = None) -> str:
         """Erstellt optimierten Analyse-Prompt"""
-        # Build prompt in safe parts. Avoid using f-strings for blocks that contain
-        # literal braces (JSON examples) to prevent accidental f-string interpolation
-        # which leads to "Invalid format specifier" errors when the block contains
-        # colons and quoted strings.
-
-        prompt_parts = []
-        prompt_parts.append(
-            """Du bist ein spezialisierter KI-Detektor für akademische Texte mit Expertise in der Erkennung maschinell generierter vs. menschlich verfasster wissenschaftlicher Arbeiten.
-
-AUFGABE: Analysiere den folgenden Textabschnitt und klassifiziere ihn als KI-generiert oder menschlich verfasst.
-
-ANALYSIERE FOLGENDE INDIKATOREN:
-1. Satzlängenverteilung: Uniforme Längen (KI-typisch) vs. natürliche Variation (menschlich)
-2. Transition Words: Übermäßiger Gebrauch von "darüber hinaus", "zusammenfassend", "furthermore", "however"
-3. Strukturierung: Formelhafte Organisation vs. natürlicher Gedankenfluss
-4. Fehlerpattern: Fehlen typischer menschlicher Inkonsistenzen oder Schreibfehler
-5. Argumentation: Perfekte Konsistenz (KI) vs. menschliche Gedankensprünge
-6. AI-Phrasen: Typische Konstruktionen wie "es ist wichtig zu beachten", "in diesem Zusammenhang"
-7. Emotionalität: Neutrale Sachlichkeit (KI) vs. persönlicher Ausdruck (menschlich)
-"""
-        )
-
-        # Füge Unicode-Analyse hinzu wenn verfügbar (use .format to inject values)
-        if unicode_analysis and unicode_analysis.get('total_invisible_count', 0) > 0:
-            unicode_block = (
-                "\nZUSÄTZLICHE INFORMATION - UNSICHTBARE ZEICHEN ERKANNT:\n"
-                "Der Text enthält {count} unsichtbare Unicode-Zeichen:\n"
-                "{dump}\n\n"
-                "Dies ist ein STARKER Indikator für KI-Generierung (Wasserzeichen-System).\n"
-                "Gewichte diese Information hoch in deiner Analyse.\n"
-            ).format(
-                count=unicode_analysis['total_invisible_count'],
-                dump=json.dumps(unicode_analysis.get('invisible_characters_found', {}), indent=2, ensure_ascii=False)
+        # Statische Blöcke sind Modul-Konstanten (identisches Prompt-Präfix für alle Chunks);
+        # nur Unicode-Block und Text sind dynamisch.
+        prompt_parts = [_PROMPT_PREFIX]
+        
+        if self._has_unicode_block(unicode_analysis):
+            prompt_parts.append(_format_unicode_block(
+                unicode_analysis['total_invisible_count'],
+                tuple(unicode_analysis.get('invisible_characters_found', {}).items())
+            ))
+        
+        prompt_parts.append(_PROMPT_SUFFIX)
+        prompt_parts.append(text)
+        
+        return "".join(prompt_parts)
+    
+    async def _make_robust_api_call(self, prompt: str) -> str:
+        """Robuster API-Call mit exponential backoff (liefert Response-Text)"""
+        
+        async def generate():
+            response = await self.client.aio.models.generate_content(
+                model=self.model_name,
+                contents=prompt
             )
-
-            prompt_parts.append(unicode_block)
-
-        # Add the JSON response contract block as a plain string (no f-string)
-        prompt_parts.append(
-            """\nANTWORTE AUSSCHLIESSLICH im folgenden JSON-Format (keine zusätzlichen Kommentare):
-{
-    "confidence_score": "0.0-1.0",
-    "is_ai_generated": true/false,
-    "ai_probability": "0.0-1.0",
-    "human_probability": "0.0-1.0",
-    "reasoning": "Detaillierte Begründung der Klassifikation in 2-3 Sätzen",
-    "specific_indicators": ["Liste der erkannten Indikatoren"],
-    "suspicious_phrases": ["Verdächtige Phrasen falls gefunden"],
-    "text_metrics": {
-        "sentence_uniformity": "low/medium/high",
-        "vocabulary_complexity": "low/medium/high",
-        "emotional_expression": "low/medium/high"
-    }
-}
-\nZU ANALYSIERENDER TEXT:\n"""
-        )
-
-        # Finally append the actual text to analyze (slice to chunk_size)
-        prompt_parts.append(text[:self.chunk_size])
-
-        prompt = "".join(prompt_parts)
-        return prompt
+            
+            # response.text nur einmal materialisieren
+            response_text = response.text if response else None
+            if response_text:
+                return response_text
+            else:
+                raise ValueError("Leere API-Response")
+        
+        return await self._call_with_retries(generate)
+    
+    async def _make_robust_count_tokens_call(self, contents: str) -> Any:
+        """Robuster count_tokens-Call (leichtgewichtiger Verbindungstest)"""
+        
+        async def count_tokens():
+            return await self.client.aio.models.count_tokens(
+                model=self.model_name,
+                contents=contents
+            )
+        
+        return await self._call_with_retries(count_tokens)
     
-    def _make_robust_api_call(self, prompt: str) -> Any:
-        """Robuster API-Call mit exponential backoff"""
+    async def _call_with_retries(self, request) -> Any:
+        """Führt request() mit Retries und exponential backoff aus"""
+        max_attempts = self.max_retries
         
-        for attempt in range(self.max_retries):
+        for attempt in range(max_attempts):
             try:
-                response = self.client.models.generate_content(
-                    model=self.model_name,
-                    contents=prompt
-                )
-                
-                if response and response.text:
-                    return response
-                else:
-                    raise ValueError("Leere API-Response")
+                return await request()
                     
             except Exception as e:
-                wait_time = self.retry_delay_base ** attempt
+                # Server-Vorgabe bevorzugen, sonst Full-Jitter gegen synchrone Retries paralleler Chunks
+                retry_after = self._get_retry_after(e)
+                if retry_after is not None:
+                    wait_time = min(retry_after, self.max_retry_after)
+                    if retry_after > self.max_retry_after:
+                        self.logger.warning("⚠️ Retry-After %.1fs vom Server auf %.1fs begrenzt",
+                                            retry_after, self.max_retry_after)
+                else:
+                    wait_time = random.uniform(0, self.retry_delay_base ** attempt)
                 self.logger.warning("⚠️ API-Call Versuch %d/%d fehlgeschlagen: %s", 
-                                  attempt + 1, self.max_retries, str(e))
+                                  attempt + 1, max_attempts, str(e))
                 
-                if attempt < self.max_retries - 1:
-                    self.logger.info("⏳ Warte %ds vor erneutem Versuch...", wait_time)
-                    time.sleep(wait_time)
+                if attempt < max_attempts - 1:
+                    self.logger.info("⏳ Warte %.1fs vor erneutem Versuch...", wait_time)
+                    await asyncio.sleep(wait_time)
                 else:
-                    raise Exception(f"API-Call nach {self.max_retries} Versuchen fehlgeschlagen: {str(e)}")
+                    raise Exception(f"API-Call nach {max_attempts} Versuchen fehlgeschlagen: {str(e)}")
+    
+    @staticmethod
+    def _get_retry_after(error: Exception) -> Optional[float]:
+        """Liest Retry-After (Sekunden) aus SDK-Fehler, falls vorhanden"""
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is None:
+            headers = getattr(getattr(error, 'response', None), 'headers', None)
+            if headers is not None:
+                retry_after = headers.get('retry-after')
+        
+        try:
+            return max(0.0, float(retry_after)) if retry_after is not None else None
+        except (TypeError, ValueError):
+            return None
     
     def _parse_api_response(self, response_text: str) -> Dict[str, Any]:
         """Parst und validiert API-Response"""
         try:
             # Extrahiere JSON aus Response
             json_start = response_text.find('{')
-            json_end = response_text.rfind('}') + 1
             
-            if json_start == -1 or json_end <= json_start:
+            if json_start == -1:
                 raise ValueError("Keine gültige JSON-Struktur gefunden")
             
-            json_str = response_text[json_start:json_end]
-            result = json.loads(json_str)
+            try:
+                # Reine JSON-Antwort (Normalfall): schneller Parser auf dem Rest
+                result = _json_loads(response_text[json_start:])
+            except json.JSONDecodeError:
+                # Nachgestellter Text (z.B. Markdown-Fence): erstes Objekt dekodieren, Rest ignorieren
+                result, _ = _JSON_DECODER.raw_decode(response_text, json_start)
+            
+            if not isinstance(result, dict):
+                raise ValueError("Keine gültige JSON-Struktur gefunden")
             
             # Validiere Pflichtfelder
             required_fields = ['confidence_score', 'is_ai_generated', 'ai_probability']
@@ -328,45 +713,45 @@ ANALYSIERE FOLGENDE INDIKATOREN:
             self.logger.error("❌ Response-Parsing Fehler: %s", str(e))
             raise ValueError(f"Response-Validierung fehlgeschlagen: {str(e)}")
     
-    def _aggregate_chunk_results(self, chunk_results: List[Dict], original_text: str) -> Dict[str, Any]:
+    def _aggregate_chunk_results(self, chunk_results: List[ChunkSummary], original_text: str) -> Dict[str, Any]:
         """Aggregiert Chunk-Ergebnisse mit gewichtetem Durchschnitt"""
         
         if not chunk_results:
             return {'success': False, 'error': 'Keine Chunk-Ergebnisse zum Aggregieren'}
         
-        # Extrahiere Werte
-        confidences = [r.get('confidence_score', 0.0) for r in chunk_results]
-        ai_probs = [r.get('ai_probability', 0.5) for r in chunk_results]
+        # Ein Durchlauf: Summen, Indikatoren und erstes Reasoning sammeln
+        total_weight = 0.0
+        weighted_ai_sum = 0.0
+        ai_prob_sum = 0.0
+        # Geordnete, begrenzte Duplikat-Filter (dict als Ordered Set)
+        unique_indicators = {}
+        unique_suspicious = {}
+        first_reasoning = None
+        
+        for summary in chunk_results:
+            total_weight += summary.confidence_score
+            weighted_ai_sum += summary.ai_probability * summary.confidence_score
+            ai_prob_sum += summary.ai_probability
+            
+            if len(unique_indicators) < self.max_indicators:
+                self._collect_unique(unique_indicators, summary.specific_indicators, self.max_indicators)
+            
+            if len(unique_suspicious) < self.max_suspicious_phrases:
+                self._collect_unique(unique_suspicious, summary.suspicious_phrases, self.max_suspicious_phrases)
+            
+            if first_reasoning is None and summary.reasoning:
+                first_reasoning = summary.reasoning
         
         # Gewichteter Durchschnitt basierend auf Confidence
-        total_weight = sum(confidences)
         if total_weight > 0:
-            weighted_ai_prob = sum(ai_prob * conf for ai_prob, conf in zip(ai_probs, confidences)) / total_weight
-            avg_confidence = sum(confidences) / len(confidences)
+            weighted_ai_prob = weighted_ai_sum / total_weight
+            avg_confidence = total_weight / len(chunk_results)
         else:
-            weighted_ai_prob = sum(ai_probs) / len(ai_probs)
+            weighted_ai_prob = ai_prob_sum / len(chunk_results)
             avg_confidence = 0.5
         
-        # Sammle alle Indikatoren
-        all_indicators = []
-        all_suspicious_phrases = []
-        
-        for result in chunk_results:
-            indicators = result.get('specific_indicators', [])
-            if isinstance(indicators, list):
-                all_indicators.extend(indicators)
-            
-            phrases = result.get('suspicious_phrases', [])
-            if isinstance(phrases, list):
-                all_suspicious_phrases.extend(phrases)
-        
-        # Entferne Duplikate und behalte häufigste
-        unique_indicators = list(dict.fromkeys(all_indicators))[:10]
-        unique_suspicious = list(dict.fromkeys(all_suspicious_phrases))[:5]
-        
         # Kombiniere Reasoning
-        reasoning_parts = [r.get('reasoning', '') for r in chunk_results if r.get('reasoning')]
-        combined_reasoning = f"Kombinierte Analyse von {len(chunk_results)} Textabschnitten zeigt konsistente Muster. {reasoning_parts[0] if reasoning_parts else 'Weitere Details in den Indikatoren.'}"
+        combined_reasoning = f"Kombinierte Analyse von {len(chunk_results)} Textabschnitten zeigt konsistente Muster. {first_reasoning or 'Weitere Details in den Indikatoren.'}"
         
         return {
             'success': True,
@@ -375,12 +760,12 @@ ANALYSIERE FOLGENDE INDIKATOREN:
             'ai_probability': weighted_ai_prob,
             'human_probability': 1.0 - weighted_ai_prob,
             'reasoning': combined_reasoning,
-            'specific_indicators': unique_indicators,
-            'suspicious_phrases': unique_suspicious,
+            'specific_indicators': list(unique_indicators),
+            'suspicious_phrases': list(unique_suspicious),
             'text_metrics': self._aggregate_text_metrics(chunk_results),
             'analysis_summary': {
                 'total_chunks_analyzed': len(chunk_results),
-                'successful_chunks': len([r for r in chunk_results if r.get('success')]),
+                'successful_chunks': len(chunk_results),  # nur erfolgreiche Chunks werden projiziert
                 'text_length': len(original_text),
                 'analysis_method': 'chunked_with_overlap',
                 'average_chunk_confidence': avg_confidence
@@ -389,7 +774,16 @@ ANALYSIERE FOLGENDE INDIKATOREN:
             'model_used': self.model_name
         }
     
-    def _aggregate_text_metrics(self, chunk_results: List[Dict]) -> Dict[str, str]:
+    @staticmethod
+    def _collect_unique(seen: Dict[Any, None], values: Tuple[Any, ...], limit: int):
+        """Übernimmt neue Werte in Reihenfolge, bis limit erreicht ist"""
+        for value in values:
+            if len(seen) >= limit:
+                break
+            if value not in seen:
+                seen[value] = None
+    
+    def _aggregate_text_metrics(self, chunk_results: List[ChunkSummary]) -> Dict[str, str]:
         """Aggregiert Text-Metriken aus Chunks"""
         
         metrics = {
@@ -399,24 +793,20 @@ ANALYSIERE FOLGENDE INDIKATOREN:
         }
         
         # Sammle alle Metrik-Werte
-        for result in chunk_results:
-            text_metrics = result.get('text_metrics', {})
-            for metric_name in metrics.keys():
-                value = text_metrics.get(metric_name, 'medium')
-                if value in ['low', 'medium', 'high']:
-                    metrics[metric_name].append(value)
+        for summary in chunk_results:
+            for metric_name, values in metrics.items():
+                value = getattr(summary, metric_name)
+                # Modell-Ausgabe ist unzuverlässig: Listen/Dicts wären für das frozenset unhashbar
+                if isinstance(value, str) and value in _VALID_METRIC_LEVELS:
+                    values.append(value)
         
         # Bestimme häufigste Werte
         aggregated = {}
         for metric_name, values in metrics.items():
             if values:
-                # Zähle Vorkommen
-                counts = {'low': 0, 'medium': 0, 'high': 0}
-                for value in values:
-                    counts[value] += 1
-                
-                # Häufigster Wert
-                aggregated[metric_name] = max(counts, key=counts.get)
+                # Zähle Vorkommen; bei Gleichstand gewinnt die niedrigere Stufe
+                counts = Counter(values)
+                aggregated[metric_name] = max(_METRIC_LEVELS, key=counts.__getitem__)
             else:
                 aggregated[metric_name] = 'medium'
         
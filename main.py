@@ -1,14 +1,66 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
+import queue
+import io
 import json
 import time
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
 
-from pdf_processor import PDFProcessor
-from gemini_analyzer import GeminiAnalyzer
+# PDF- und Gemini-Module (inkl. Google SDK) erst bei Bedarf laden: das Fenster erscheint schneller
+if TYPE_CHECKING:
+    from pdf_processor import PDFProcessor
+    from gemini_analyzer import GeminiAnalyzer
+
+try:
+    import orjson  # Optional: schnellerer JSON-Export
+except ImportError:
+    orjson = None
+
+# Intervall, in dem Thread-Ausgaben gebündelt ins Ergebnisfeld übernommen werden
+_RESULTS_DRAIN_INTERVAL_MS = 50
+
+# Mindestabstand zwischen zwei weitergereichten Progress-Meldungen des Analyzers
+_PROGRESS_THROTTLE_INTERVAL_S = 0.25
+
+# Max. Zeilen im Ergebnisfeld; ältere Zeilen werden oben eingeklappt
+_RESULTS_MAX_LINES = 1000
+
+# Platzhalter für eingeklappte Ausgaben (vollständiger Text bleibt im Log-Puffer)
+_RESULTS_FOLDED_PLACEHOLDER = "[… ältere Ausgaben ausgeblendet - vollständiges Protokoll im Text-Export]\n"
+
+# Vorlagen für die Ergebnisanzeige (ein format_map-Aufruf pro Analyse)
+_RESULTS_HEADER = "\n🎯 ANALYSE ABGESCHLOSSEN\n" + "="*50 + "\n\n"
+
+_RESULTS_TEMPLATE = _RESULTS_HEADER + (
+    "{verdict}\n\n"
+    "📊 WAHRSCHEINLICHKEITEN:\n"
+    "   • KI-generiert: {ai_prob:.1f}%\n"
+    "   • Menschlich: {human_prob:.1f}%\n"
+    "   • Vertrauen: {confidence_level} ({confidence:.1f}%)\n\n"
+    "{sections}"
+)
+
+_RESULTS_FAILED_TEMPLATE = _RESULTS_HEADER + (
+    "❌ ANALYSE FEHLGESCHLAGEN\n\n"
+    "Fehler: {error}\n\n"
+)
+
+# Vertrauensstufen: (Schwelle in %, Label), absteigend; darunter "Niedrig"
+_CONFIDENCE_BANDS = ((75, "Hoch"), (50, "Mittel"))
+
+_VERDICT_LABELS = {True: '🤖 KI-GENERIERT', False: '👤 MENSCHLICH VERFASST'}
+
+_METRICS_TEMPLATE = (
+    "📈 TEXT-METRIKEN:\n"
+    "   • Satzgleichmäßigkeit: {sentence_uniformity}\n"
+    "   • Wortschatz-Komplexität: {vocabulary_complexity}\n"
+    "   • Emotionaler Ausdruck: {emotional_expression}\n\n"
+)
 
 class KIScannerApp:
     """
@@ -35,22 +87,46 @@ class KIScannerApp:
         self.pdf_path_var = tk.StringVar()
         self.check_invisible_var = tk.BooleanVar(value=True)
         self.detailed_analysis_var = tk.BooleanVar(value=True)
+        self.response_cache_var = tk.BooleanVar(value=True)
         
         # Komponenten
-        self.pdf_processor = PDFProcessor()
-        self.gemini_analyzer: Optional[GeminiAnalyzer] = None
+        self._pdf_processor: Optional['PDFProcessor'] = None
+        self._pdf_pool: Optional[ProcessPoolExecutor] = None  # PDF-Parsing außerhalb des GIL (lazy)
+        self.gemini_analyzer: Optional['GeminiAnalyzer'] = None
         self.current_analysis_results: Optional[Dict[str, Any]] = None
         self.analysis_thread: Optional[threading.Thread] = None
+        self._analysis_lock = threading.Lock()  # Gehalten von Start bis _analysis_completed
+        
+        # Ausgaben aus Worker-Threads (werden im Main-Thread gebündelt eingefügt)
+        self._pending_results = queue.SimpleQueue()
+        self._pending_status = queue.SimpleQueue()
+        self._pending_chunk_progress = queue.SimpleQueue()  # (completed, total), nur der neueste zählt
+        self._progress_flush: Optional[Callable[..., None]] = None  # Nachlauf-Flush der Progress-Drossel
+        self._status_var = tk.StringVar(value="Bereit für Analyse...")
+        self._file_info_var = tk.StringVar()
+        
+        # Vollständiges Protokoll parallel zum Widget (Text-Export ohne Widget-get)
+        self._log_buffer = io.StringIO()
+        self._results_folded = False
         
         # Logging
         self.logger = logging.getLogger(__name__)
         
         # GUI erstellen
         self._create_gui()
+        self.root.after(_RESULTS_DRAIN_INTERVAL_MS, self._drain_pending_updates)
         
         # Cleanup bei Schließen
         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
     
+    @property
+    def pdf_processor(self) -> 'PDFProcessor':
+        """PDFProcessor (wird beim ersten Zugriff importiert und erstellt)"""
+        if self._pdf_processor is None:
+            from pdf_processor import PDFProcessor
+            self._pdf_processor = PDFProcessor()
+        return self._pdf_processor
+    
     def _create_gui(self):
         """Erstellt die komplette GUI"""
         
@@ -130,7 +206,7 @@ class KIScannerApp:
         browse_button.grid(row=0, column=2)
         
         # Datei-Info Label
-        self.file_info_label = ttk.Label(pdf_frame, text="", font=('Arial', 9), foreground='gray')
+        self.file_info_label = ttk.Label(pdf_frame, textvariable=self._file_info_var, font=('Arial', 9), foreground='gray')
         self.file_info_label.grid(row=1, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
         
         pdf_frame.columnconfigure(1, weight=1)
@@ -150,11 +226,19 @@ class KIScannerApp:
                                        variable=self.detailed_analysis_var)
         detailed_check.grid(row=1, column=0, sticky=tk.W)
         
+        cache_check = ttk.Checkbutton(options_frame, text="Gemini-Antworten lokal zwischenspeichern (30 Tage)", 
+                                    variable=self.response_cache_var)
+        cache_check.grid(row=2, column=0, sticky=tk.W)
+        
+        clear_cache_button = ttk.Button(options_frame, text="Cache leeren", command=self._clear_response_cache)
+        clear_cache_button.grid(row=2, column=1, sticky=tk.W, padx=(10, 0))
+        
         # Info-Text
         info_text = ("• Unsichtbare Zeichen-Prüfung erkennt AI-Wasserzeichen (Zero-Width Spaces)\n"
-                    "• Detaillierte Analyse bietet umfangreichere Begründungen")
+                    "• Detaillierte Analyse bietet umfangreichere Begründungen\n"
+                    "• Der Cache enthält Begründungen und zitierte Phrasen aus dem Dokument")
         info_label = ttk.Label(options_frame, text=info_text, font=('Arial', 8), foreground='gray')
-        info_label.grid(row=2, column=0, sticky=tk.W, pady=(10, 0))
+        info_label.grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=(10, 0))
     
     def _create_analysis_section(self, parent, row):
         """Analyse-Button und Progress Sektion"""
@@ -172,7 +256,7 @@ class KIScannerApp:
         self.progress_bar.pack(fill=tk.X, pady=(0, 5))
         
         # Status-Label
-        self.status_label = ttk.Label(analysis_frame, text="Bereit für Analyse...", font=('Arial', 9))
+        self.status_label = ttk.Label(analysis_frame, textvariable=self._status_var, font=('Arial', 9))
         self.status_label.pack()
     
     def _create_results_section(self, parent, row):
@@ -233,11 +317,12 @@ class KIScannerApp:
         
         def test_connection():
             try:
+                from gemini_analyzer import GeminiAnalyzer
                 analyzer = GeminiAnalyzer(api_key)
                 result = analyzer.test_connection()
                 
                 # Zurück zum Main Thread für GUI-Updates
-                self.root.after(0, lambda: self._handle_connection_test_result(result, test_button))
+                self.root.after(0, lambda: self._handle_connection_test_result(result, test_button, analyzer))
                 
             except Exception as e:
                 error_result = {
@@ -249,13 +334,14 @@ class KIScannerApp:
         # Starte Test in separatem Thread
         threading.Thread(target=test_connection, daemon=True).start()
     
-    def _handle_connection_test_result(self, result, test_button):
+    def _handle_connection_test_result(self, result, test_button, analyzer=None):
         """Behandelt Ergebnis des Connection-Tests"""
         
         test_button.config(state=tk.NORMAL, text="Verbindung testen")
         
         if result['success']:
-            self.gemini_analyzer = GeminiAnalyzer(self.api_key_var.get().strip())
+            # Bereits getesteten Client übernehmen statt neu zu initialisieren
+            self.gemini_analyzer = analyzer
             messagebox.showinfo("Erfolg", f"✅ {result['message']}\n\n" +
                               f"Response-Zeit: {result.get('response_time', 'N/A')}s")
         else:
@@ -274,15 +360,36 @@ class KIScannerApp:
         
         if file_path:
             self.pdf_path_var.set(file_path)
+            self._file_info_var.set("Datei ausgewählt")
             
-            # Zeige Datei-Informationen
-            try:
-                file_info = Path(file_path)
-                size_mb = file_info.stat().st_size / (1024 * 1024)
-                info_text = f"📄 {file_info.name} ({size_mb:.1f} MB)"
-                self.file_info_label.config(text=info_text)
-            except:
-                self.file_info_label.config(text="Datei ausgewählt")
+            # Datei-Informationen im Hintergrund ermitteln (stat() kann auf langsamen Laufwerken blockieren)
+            threading.Thread(target=self._compute_file_info, args=(file_path,), daemon=True).start()
+    
+    def _compute_file_info(self, file_path):
+        """Ermittelt Datei-Informationen (läuft in separatem Thread)"""
+        try:
+            file_info = Path(file_path)
+            size_mb = file_info.stat().st_size / (1024 * 1024)
+            info_text = f"📄 {file_info.name} ({size_mb:.1f} MB)"
+        except OSError:
+            self.root.after(0, lambda: self._show_file_info(file_path, "Datei ausgewählt"))
+            return
+        
+        # Titel aus den PDF-Metadaten (liest nur das Info-Dictionary, keine Seiten)
+        try:
+            title = self.pdf_processor.get_metadata(file_path).get('title')
+        except Exception as e:
+            self.logger.debug("PDF-Metadaten nicht lesbar: %s", str(e))
+            title = None
+        if title:
+            info_text = f"{info_text} · „{title}“"
+        
+        self.root.after(0, lambda: self._show_file_info(file_path, info_text))
+    
+    def _show_file_info(self, file_path, info_text):
+        """Zeigt Datei-Informationen, sofern die Datei noch ausgewählt ist"""
+        if self.pdf_path_var.get() == file_path:
+            self._file_info_var.set(info_text)
     
     def _start_analysis(self):
         """Startet die Analyse in separatem Thread"""
@@ -296,14 +403,16 @@ class KIScannerApp:
             messagebox.showerror("Fehler", "Bitte wähle eine PDF-Datei aus.")
             return
         
-        # Prüfe ob bereits Analyse läuft
-        if self.analysis_thread and self.analysis_thread.is_alive():
+        # Prüfe ob bereits Analyse läuft (try-acquire statt is_alive: kein Doppelklick-Race)
+        if not self._analysis_lock.acquire(blocking=False):
             messagebox.showwarning("Hinweis", "Eine Analyse läuft bereits. Bitte warten...")
             return
 
         # UI für Analyse vorbereiten
         self.analyze_button.config(state=tk.DISABLED, text="Analyse läuft...")
         self.export_button.config(state=tk.DISABLED)
+        # Bis die Chunk-Anzahl feststeht (PDF-Verarbeitung) unbestimmt animieren
+        self.progress_bar.config(mode='indeterminate', value=0)
         self.progress_bar.start(10)
         self._update_status("Analyse wird gestartet...")
         self._update_results("🔄 ANALYSE GESTARTET\n" + "="*50 + "\n\n")
@@ -320,7 +429,7 @@ class KIScannerApp:
             self._update_status_threadsafe("📄 PDF wird verarbeitet...")
             self._update_results_threadsafe("📄 PDF-Verarbeitung gestartet...\n")
             
-            pdf_result = self.pdf_processor.process_pdf(self.pdf_path_var.get())
+            pdf_result = self._process_pdf_out_of_process(self.pdf_path_var.get())
             
             if not pdf_result['success']:
                 raise Exception(f"PDF-Verarbeitung fehlgeschlagen: {pdf_result['error']}")
@@ -334,6 +443,7 @@ class KIScannerApp:
 📊 Dokument-Statistiken:
    • Seiten: {file_info['num_pages']}
    • Dateigröße: {file_info['file_size_mb']} MB
+   • SHA-256: {(file_info.get('sha256') or 'n/a')[:12]}
    • Wörter: {stats['total_words']:,}
    • Zeichen: {stats['total_characters']:,}
    • Geschätzte Lesezeit: {stats['estimated_reading_time_minutes']} Min
@@ -353,21 +463,68 @@ class KIScannerApp:
             # 2. Gemini Analyzer initialisieren
             if not self.gemini_analyzer:
                 self._update_status_threadsafe("🔑 Gemini API wird initialisiert...")
+                from gemini_analyzer import GeminiAnalyzer
                 self.gemini_analyzer = GeminiAnalyzer(self.api_key_var.get().strip())
+            self.gemini_analyzer.cache_enabled = self.response_cache_var.get()
             
             # 3. Text analysieren
             self._update_status_threadsafe("🤖 KI-Analyse läuft...")
             self._update_results_threadsafe("🤖 Starte KI-Textanalyse mit Gemini...\n")
             
+            # Chunk-Anzahl steht vorab fest - Fortschritt pro Chunk statt Dauer-Animation
+            total_chunks = self.gemini_analyzer.estimate_chunks(pdf_result['cleaned_text'])
+            self.root.after(0, self._start_chunk_progress, total_chunks)
+            
+            # Progress-Meldungen drosseln: nur der neueste Stand wird höchstens alle 250 ms weitergereicht.
+            # Zurückgehaltenes holt der Drain-Poller nach Ablauf des Intervalls nach (Nachlauf-Flush),
+            # daher nur Queue-Puts unter dem Lock - keine Tk-Aufrufe
+            progress_lock = threading.Lock()
+            pending_message = None
+            pending_chunk_progress = None
+            last_flush = 0.0
+            
+            def flush_progress(only_if_due=False):
+                nonlocal pending_message, pending_chunk_progress, last_flush
+                with progress_lock:
+                    if pending_message is None and pending_chunk_progress is None:
+                        return
+                    if only_if_due and time.monotonic() - last_flush < _PROGRESS_THROTTLE_INTERVAL_S:
+                        return
+                    
+                    last_flush = time.monotonic()
+                    if pending_message is not None:
+                        message, pending_message = pending_message, None
+                        self._update_status_threadsafe(message)
+                        self._update_results_threadsafe(f"   {message}\n")
+                    
+                    if pending_chunk_progress is not None:
+                        chunk_progress, pending_chunk_progress = pending_chunk_progress, None
+                        self._pending_chunk_progress.put(chunk_progress)
+            
             def progress_callback(message):
-                self._update_status_threadsafe(message)
-                self._update_results_threadsafe(f"   {message}\n")
+                nonlocal pending_message
+                with progress_lock:
+                    pending_message = message
+                flush_progress(only_if_due=True)
+            
+            def chunk_progress_callback(completed, total):
+                nonlocal pending_chunk_progress
+                with progress_lock:
+                    pending_chunk_progress = (completed, total)
+                flush_progress(only_if_due=True)
             
-            analysis_result = self.gemini_analyzer.analyze_document(
-                pdf_result['cleaned_text'],
-                pdf_result['unicode_analysis'],
-                progress_callback
-            )
+            self._progress_flush = flush_progress
+            try:
+                analysis_result = self.gemini_analyzer.analyze_document(
+                    pdf_result['cleaned_text'],
+                    pdf_result['unicode_analysis'],
+                    progress_callback,
+                    chunk_progress_callback
+                )
+            finally:
+                # Letzte zurückgehaltene Meldung nicht verlieren
+                self._progress_flush = None
+                flush_progress()
             
             # 4. Ergebnisse zusammenstellen
             combined_results = {
@@ -395,6 +552,22 @@ class KIScannerApp:
             # UI zurücksetzen
             self.root.after(0, self._analysis_completed)
 
+    def _process_pdf_out_of_process(self, pdf_path: str) -> Dict[str, Any]:
+        """Verarbeitet die PDF in einem Worker-Prozess (konkurriert nicht mit Tk um den GIL)"""
+        from pdf_processor import process_pdf_file
+        
+        if self._pdf_pool is None:
+            self._pdf_pool = ProcessPoolExecutor(max_workers=1)
+        
+        try:
+            # Seitentexte nicht behalten: halbiert Ergebnisgröße (IPC, Speicher, Export) - full_text bleibt
+            return self._pdf_pool.submit(process_pdf_file, pdf_path, False).result()
+        except BrokenProcessPool as e:
+            # Worker-Prozess abgestürzt oder nicht startbar - im Thread weiterarbeiten
+            self.logger.warning("⚠️ PDF-Worker-Prozess nicht verfügbar (%s) - verarbeite im Thread", str(e))
+            self._pdf_pool = None
+            return self.pdf_processor.process_pdf(pdf_path, keep_page_texts=False)
+    
     def _display_final_results(self):
         """Zeigt die finalen Analyseergebnisse an"""
         
@@ -404,63 +577,63 @@ class KIScannerApp:
         ai_analysis = self.current_analysis_results['ai_analysis']
         pdf_data = self.current_analysis_results['pdf_data']
         
-        results_text = "\n🎯 ANALYSE ABGESCHLOSSEN\n" + "="*50 + "\n\n"
-        
         if ai_analysis.get('success'):
             # Hauptergebnisse
-            is_ai = ai_analysis['is_ai_generated']
             confidence = ai_analysis['confidence_score'] * 100
-            ai_prob = ai_analysis['ai_probability'] * 100
-            human_prob = ai_analysis['human_probability'] * 100
-            
-            results_text += f"{ '🤖 KI-GENERIERT' if is_ai else '👤 MENSCHLICH VERFASST' }\n\n"
             
-            results_text += f"📊 WAHRSCHEINLICHKEITEN:\n"
-            results_text += f"   • KI-generiert: {ai_prob:.1f}%\n"
-            results_text += f"   • Menschlich: {human_prob:.1f}%\n"
-            results_text += f"   • Vertrauen: {'Hoch' if confidence > 75 else 'Mittel' if confidence > 50 else 'Niedrig'} ({confidence:.1f}%)\n\n"
+            # Optionale Abschnitte sammeln und einmal zusammenfügen
+            sections = []
             
             # Begründung
             if ai_analysis.get('reasoning'):
-                results_text += f"💭 BEGRÜNDUNG:\n{ai_analysis['reasoning']}\n\n"
+                sections.append(f"💭 BEGRÜNDUNG:\n{ai_analysis['reasoning']}\n\n")
             
             # Indikatoren
             if ai_analysis.get('specific_indicators'):
-                results_text += f"🔍 ERKANNTE INDIKATOREN:\n"
-                for indicator in ai_analysis['specific_indicators'][:8]:  # Top 8
-                    results_text += f"   • {indicator}\n"
-                results_text += "\n"
+                sections.append("🔍 ERKANNTE INDIKATOREN:\n")
+                sections.extend(f"   • {indicator}\n" for indicator in ai_analysis['specific_indicators'][:8])  # Top 8
+                sections.append("\n")
             
             # Verdächtige Phrasen
             if ai_analysis.get('suspicious_phrases'):
-                results_text += f"⚠️ VERDÄCHTIGE PHRASEN:\n"
-                for phrase in ai_analysis['suspicious_phrases'][:5]:  # Top 5
-                    results_text += f"   • \"{phrase}\"\n"
-                results_text += "\n"
+                sections.append("⚠️ VERDÄCHTIGE PHRASEN:\n")
+                sections.extend(f"   • \"{phrase}\"\n" for phrase in ai_analysis['suspicious_phrases'][:5])  # Top 5
+                sections.append("\n")
             
             # Text-Metriken
             if ai_analysis.get('text_metrics'):
                 metrics = ai_analysis['text_metrics']
-                results_text += f"📈 TEXT-METRIKEN:\n"
-                results_text += f"   • Satzgleichmäßigkeit: {metrics.get('sentence_uniformity', 'N/A').title()}\n"
-                results_text += f"   • Wortschatz-Komplexität: {metrics.get('vocabulary_complexity', 'N/A').title()}\n"
-                results_text += f"   • Emotionaler Ausdruck: {metrics.get('emotional_expression', 'N/A').title()}\n\n"
+                sections.append(_METRICS_TEMPLATE.format_map({
+                    'sentence_uniformity': metrics.get('sentence_uniformity', 'N/A').title(),
+                    'vocabulary_complexity': metrics.get('vocabulary_complexity', 'N/A').title(),
+                    'emotional_expression': metrics.get('emotional_expression', 'N/A').title()
+                }))
             
             # Technische Details
             if ai_analysis.get('analysis_summary'):
                 summary = ai_analysis['analysis_summary']
-                results_text += f"🔧 TECHNISCHE DETAILS:\n"
-                results_text += f"   • Analyse-Methode: {summary.get('analysis_method', 'N/A').replace('_', ' ').title()}\n"
+                sections.append("🔧 TECHNISCHE DETAILS:\n")
+                sections.append(f"   • Analyse-Methode: {summary.get('analysis_method', 'N/A').replace('_', ' ').title()}\n")
                 
                 if 'total_chunks_analyzed' in summary:
-                    results_text += f"   • Chunks analysiert: {summary['total_chunks_analyzed']}\n"
-                    results_text += f"   • Erfolgreiche Chunks: {summary['successful_chunks']}\n"
+                    sections.append(f"   • Chunks analysiert: {summary['total_chunks_analyzed']}\n")
+                    sections.append(f"   • Erfolgreiche Chunks: {summary['successful_chunks']}\n")
                 
-                results_text += f"   • Modell: {ai_analysis.get('model_used', 'Gemini')}\n\n"
+                sections.append(f"   • Modell: {ai_analysis.get('model_used', 'Gemini')}\n\n")
+            
+            results_text = _RESULTS_TEMPLATE.format_map({
+                'verdict': _VERDICT_LABELS[bool(ai_analysis['is_ai_generated'])],
+                'ai_prob': ai_analysis['ai_probability'] * 100,
+                'human_prob': ai_analysis['human_probability'] * 100,
+                'confidence_level': next((label for threshold, label in _CONFIDENCE_BANDS if confidence > threshold), "Niedrig"),
+                'confidence': confidence,
+                'sections': "".join(sections)
+            })
             
         else:
-            results_text += f"❌ ANALYSE FEHLGESCHLAGEN\n\n"
-            results_text += f"Fehler: {ai_analysis.get('error', 'Unbekannter Fehler')}\n\n"
+            results_text = _RESULTS_FAILED_TEMPLATE.format_map({
+                'error': ai_analysis.get('error', 'Unbekannter Fehler')
+            })
         
         self._update_results(results_text, clear=False)
         
@@ -470,30 +643,121 @@ class KIScannerApp:
     
     def _update_status(self, status_text):
         """Aktualisiert Status-Label"""
-        self.status_label.config(text=status_text)
-        self.root.update_idletasks()
+        # Ältere Meldungen aus Worker-Threads sind damit überholt
+        self._take_latest_status()
+        self._status_var.set(status_text)
     
     def _update_status_threadsafe(self, status_text):
         """Thread-sichere Status-Aktualisierung"""
-        self.root.after(0, lambda: self._update_status(status_text))
+        self._pending_status.put(status_text)
+    
+    def _take_latest_status(self) -> Optional[str]:
+        """Leert die Status-Queue und liefert die neueste Meldung"""
+        latest = None
+        while True:
+            try:
+                latest = self._pending_status.get_nowait()
+            except queue.Empty:
+                return latest
+    
+    def _take_latest_chunk_progress(self) -> Optional[Tuple[int, int]]:
+        """Leert die Fortschritts-Queue und liefert den neuesten Stand"""
+        latest = None
+        while True:
+            try:
+                latest = self._pending_chunk_progress.get_nowait()
+            except queue.Empty:
+                return latest
     
     def _update_results(self, text, clear=True):
         """Aktualisiert Ergebnisbereich"""
+        # Noch wartende Thread-Ausgaben zuerst, damit die Reihenfolge erhalten bleibt
+        self._flush_pending_results()
+        self._insert_results(text, clear)
+    
+    def _insert_results(self, text, clear):
+        """Fügt Text ins Ergebnisfeld ein (ein Insert pro Aufruf)"""
         self.results_text.config(state=tk.NORMAL)
         if clear:
             self.results_text.delete(1.0, tk.END)
+            self._log_buffer = io.StringIO()
+            self._results_folded = False
         self.results_text.insert(tk.END, text)
+        self._log_buffer.write(text)
+        
+        # Widget klein halten: älteste Zeilen hinter einem Platzhalter einklappen
+        line_count = int(self.results_text.index('end-1c').split('.')[0])
+        if line_count > _RESULTS_MAX_LINES:
+            if not self._results_folded:
+                self.results_text.insert('1.0', _RESULTS_FOLDED_PLACEHOLDER)
+                self._results_folded = True
+                line_count += 1
+            # Zeile 1 ist der Platzhalter
+            self.results_text.delete('2.0', f'{line_count - _RESULTS_MAX_LINES + 2}.0')
+        
         self.results_text.see(tk.END)
         self.results_text.config(state=tk.DISABLED)
-        self.root.update_idletasks()
     
     def _update_results_threadsafe(self, text, clear=False):
         """Thread-sichere Results-Aktualisierung"""
-        self.root.after(0, lambda: self._update_results(text, clear))
+        self._pending_results.put((text, clear))
+    
+    def _flush_pending_results(self):
+        """Überträgt alle wartenden Thread-Ausgaben mit einem einzigen Insert"""
+        parts = []
+        clear = False
+        
+        while True:
+            try:
+                text, clear_requested = self._pending_results.get_nowait()
+            except queue.Empty:
+                break
+            
+            if clear_requested:
+                # Vorherige Ausgaben würden ohnehin gelöscht
+                parts.clear()
+                clear = True
+            parts.append(text)
+        
+        if parts:
+            self._insert_results("".join(parts), clear)
+    
+    def _drain_pending_updates(self):
+        """Poller im Main-Thread: bündelt Thread-Ausgaben zu ~20 Updates/s"""
+        # Von der Drossel zurückgehaltenen Stand nachreichen, sobald das Intervall abgelaufen ist
+        progress_flush = self._progress_flush
+        if progress_flush is not None:
+            progress_flush(only_if_due=True)
+        
+        self._flush_pending_results()
+        
+        # Vom Status und Chunk-Fortschritt zählt nur die neueste Meldung
+        status_text = self._take_latest_status()
+        if status_text is not None:
+            self._status_var.set(status_text)
+        
+        chunk_progress = self._take_latest_chunk_progress()
+        if chunk_progress is not None:
+            self._set_chunk_progress(*chunk_progress)
+        
+        self.root.after(_RESULTS_DRAIN_INTERVAL_MS, self._drain_pending_updates)
+    
+    def _start_chunk_progress(self, total_chunks):
+        """Schaltet die Progress-Bar auf schrittweisen Fortschritt (ein Schritt pro Chunk)"""
+        self.progress_bar.stop()
+        self.progress_bar.config(mode='determinate', maximum=total_chunks, value=0)
+    
+    def _set_chunk_progress(self, completed_chunks, total_chunks):
+        """Setzt den Chunk-Fortschritt (value statt step - step springt am Maximum auf 0)"""
+        self.progress_bar.config(maximum=total_chunks, value=completed_chunks)
     
     def _analysis_completed(self):
         """Wird nach Abschluss der Analyse aufgerufen"""
+        self._analysis_lock.release()
+        self._take_latest_chunk_progress()  # Überholt: Analyse ist abgeschlossen
         self.progress_bar.stop()
+        # Abgeschlossen = voll, auch nach vorzeitigem Abbruch oder Fehler
+        self.progress_bar.config(mode='determinate', value=self.progress_bar['maximum'])
         self.analyze_button.config(state=tk.NORMAL, text="🚀 ANALYSE STARTEN")
         self._update_status("Analyse abgeschlossen")
     
@@ -532,19 +796,58 @@ class KIScannerApp:
             try:
                 if file_path.endswith('.json'):
                     # JSON-Export
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump(self.current_analysis_results, f, indent=2, ensure_ascii=False, default=str)
+                    self._write_json_export(file_path, self.current_analysis_results)
                 else:
-                    # Text-Export
-                    current_text = self.results_text.get(1.0, tk.END)
+                    # Text-Export (aus dem Puffer, enthält auch bereits gekürzte Zeilen)
                     with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(current_text)
+                        f.write(self._log_buffer.getvalue())
                 
                 messagebox.showinfo("Erfolg", f"Ergebnisse erfolgreich exportiert:\n{file_path}")
                 
             except Exception as e:
                 messagebox.showerror("Fehler", f"Export fehlgeschlagen:\n{str(e)}")
     
+    def _write_json_export(self, file_path, data):
+        """Schreibt JSON-Export (orjson falls verfügbar, sonst json)"""
+        if orjson is not None:
+            try:
+                # orjson schreibt UTF-8 ohne ASCII-Escaping (wie ensure_ascii=False)
+                Path(file_path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str))
+                return
+            except TypeError as e:
+                # z.B. Nicht-String-Keys oder zu große Integer
+                self.logger.debug("orjson-Export nicht möglich, nutze json: %s", str(e))
+        
+        # Top-Level-Schlüssel einzeln serialisieren: ein write pro Eintrag statt pro Token,
+        # Speicherspitze ist der größte Teilbaum (z.B. der PDF-Text), nicht das ganze Dokument
+        with open(file_path, 'w', encoding='utf-8') as f:
+            if not data:
+                f.write('{}')
+                return
+            
+            f.write('{')
+            separator = '\n'
+            for key, value in data.items():
+                encoded_key = json.dumps(str(key), ensure_ascii=False)
+                # Eine Ebene tiefer einrücken (Zeilenumbrüche in Strings sind escaped)
+                encoded_value = json.dumps(value, indent=2, ensure_ascii=False, default=str).replace('\n', '\n  ')
+                f.write(f'{separator}  {encoded_key}: {encoded_value}')
+                separator = ',\n'
+            f.write('\n}')
+    
+    def _clear_response_cache(self):
+        """Löscht den lokalen Cache der Gemini-Antworten"""
+        from gemini_analyzer import RESPONSE_CACHE_PATH, clear_response_cache
+        cache_path = self.gemini_analyzer.cache_path if self.gemini_analyzer else RESPONSE_CACHE_PATH
+        
+        try:
+            removed = clear_response_cache(cache_path)
+        except OSError as e:
+            messagebox.showerror("Fehler", f"Cache konnte nicht gelöscht werden: {str(e)}")
+            return
+        
+        self._update_status("Cache geleert" if removed else "Cache ist bereits leer")
+    
     def _reset_analysis(self):
         """Setzt Analyse zurück"""
         
@@ -555,7 +858,7 @@ class KIScannerApp:
         
         # Zurücksetzen
         self.pdf_path_var.set("")
-        self.file_info_label.config(text="")
+        self._file_info_var.set("")
         self.current_analysis_results = None
         
         self.analyze_button.config(state=tk.NORMAL, text="🚀 ANALYSE STARTEN")
@@ -591,7 +894,10 @@ Verwendung der Google Gemini API.
 🔒 DATENSCHUTZ:
 • Alle Daten werden lokal verarbeitet
 • API-Key wird nur im Arbeitsspeicher gehalten
-• PDF-Inhalte werden nicht dauerhaft gespeichert
+• PDF-Dateien und extrahierte Texte werden nicht dauerhaft gespeichert
+• Gemini-Antworten (Begründungen, zitierte Phrasen) werden 30 Tage
+  lokal in ~/.aiscanner zwischengespeichert - abschaltbar und
+  löschbar unter "Analyse-Optionen"
 
 ⚡ PERFORMANCE:
 • Große Dokumente werden automatisch in Chunks aufgeteilt
@@ -636,6 +942,8 @@ Verwendung der Google Gemini API.
                 return
         
         self.logger.info("👋 Anwendung wird beendet")
+        if self._pdf_pool is not None:
+            self._pdf_pool.shutdown(wait=False)
         self.root.quit()
         self.root.destroy()
     
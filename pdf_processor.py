@@ -1,10 +1,87 @@
+import hashlib
 import logging
+import mmap
+import os
 import re
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from itertools import repeat
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 from pypdf import PdfReader
 import unicodedata
 
+try:
+    import pymupdf  # Optional: PyMuPDF (MuPDF-C-Engine, deutlich schneller als pypdf)
+except ImportError:
+    pymupdf = None
+
+# Vorkompilierte Muster für die Textstatistik
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+
+# Unsichtbare Unicode-Zeichen für Erkennung (Zeichen → Name)
+_INVISIBLE_CHARS = {
+    '\u200B': 'Zero-Width Space',
+    '\u200C': 'Zero-Width Non-Joiner',
+    '\u200D': 'Zero-Width Joiner',
+    '\u2060': 'Word Joiner',
+    '\u00AD': 'Soft Hyphen',
+    '\u200E': 'Left-to-Right Mark',
+    '\u200F': 'Right-to-Left Mark',
+    '\u2028': 'Line Separator',
+    '\u2029': 'Paragraph Separator',
+    '\uFEFF': 'Byte Order Mark'
+}
+
+# PDF-Datumsangaben (D:YYYYMMDDHHmmSS+HH'mm'), von grob nach fein wie in pypdf
+_PDF_DATE_FORMATS = (
+    "D:%Y", "D:%Y%m", "D:%Y%m%d", "D:%Y%m%d%H", "D:%Y%m%d%H%M", "D:%Y%m%d%H%M%S", "D:%Y%m%d%H%M%S%z"
+)
+
+def _format_pdf_date(raw: Optional[str]) -> str:
+    """Formatiert ein rohes PDF-Datum wie die pypdf-Metadaten (str(datetime); unlesbar: roher Wert)"""
+    if not raw:
+        return str(None)
+    
+    # Gleiche Normalisierung wie pypdf: Präfix ergänzen, Z → +0000, Apostrophe entfernen
+    text = "D:" + raw if raw[0].isdigit() else raw
+    if text.endswith(("Z", "z")):
+        text += "0000"
+    text = text.replace("z", "+").replace("Z", "+").replace("'", "")
+    offset_index = max(text.find("+"), text.find("-"))
+    if offset_index > 0 and offset_index != len(text) - 5:
+        text += "00"  # Offset ohne Minuten
+    
+    for date_format in _PDF_DATE_FORMATS:
+        try:
+            return str(datetime.strptime(text, date_format))
+        except ValueError:
+            continue
+    return raw
+
+class _CharTables(NamedTuple):
+    """Aus PDFProcessor.invisible_chars abgeleitete Scan-Strukturen"""
+    items: Tuple[Tuple[str, str], ...]
+    strip_table: Dict[int, None]
+    suspicious_re: 're.Pattern'
+
+@lru_cache(maxsize=8)
+def _build_char_tables(items: Tuple[Tuple[str, str], ...]) -> _CharTables:
+    """Baut die Scan-Strukturen einmal pro Zeichensatz (gecacht, i.d.R. nur die Defaults)"""
+    # Übersetzungstabelle für _clean_text (unsichtbare Zeichen und Private Use Area entfernen)
+    strip_table = dict.fromkeys(range(0xE000, 0xF900))
+    strip_table.update(dict.fromkeys(ord(char) for char, _ in items))
+    
+    # Ein Scan für alle gesuchten Zeichen (bekannte unsichtbare + Private Use Area)
+    suspicious_re = re.compile(
+        '[' + ''.join(re.escape(char) for char, _ in items) + '\ue000-\uf8ff]'
+    )
+    return _CharTables(items, strip_table, suspicious_re)
+
 class PDFProcessor:
     """
     Verarbeitet PDF-Dateien und extrahiert Text mit Unicode-Analyse
@@ -13,26 +90,33 @@ class PDFProcessor:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         
-        # Unsichtbare Unicode-Zeichen für Erkennung
-        self.invisible_chars = {
-            '\u200B': 'Zero-Width Space',
-            '\u200C': 'Zero-Width Non-Joiner',
-            '\u200D': 'Zero-Width Joiner',
-            '\u2060': 'Word Joiner',
-            '\u00AD': 'Soft Hyphen',
-            '\u200E': 'Left-to-Right Mark',
-            '\u200F': 'Right-to-Left Mark',
-            '\u2028': 'Line Separator',
-            '\u2029': 'Paragraph Separator',
-            '\uFEFF': 'Byte Order Mark'
-        }
+        # Unsichtbare Unicode-Zeichen für Erkennung (Änderungen wirken auf Analyse und Bereinigung)
+        self.invisible_chars = dict(_INVISIBLE_CHARS)
+        
+        # Text-Extraktion mit PyMuPDF; pypdf bleibt Fallback für PDFs, die MuPDF nicht öffnet
+        self.use_pymupdf = pymupdf is not None
+        
+        # Parallele Seiten-Extraktion (PyMuPDF): Worker-Prozesse öffnen die PDF selbst
+        # Opt-in: MuPDF braucht ~0.3-1.5 ms pro Seite, ein Worker-Start (spawn) ~0.8-1.1 s -
+        # erst bei sehr großen Dokumenten und mehreren Kernen ein Gewinn. In der GUI läuft die
+        # Extraktion ohnehin schon in einem eigenen Prozess (Pool wäre verschachtelt)
+        self.parallel_extraction = False
+        self.parallel_min_pages = 500   # Seiten je Worker; darunter lohnt der Prozess-Start nicht
+        self.max_extraction_workers = os.cpu_count() or 1
+        
+        # Ergebnis-Cache nach Dateiinhalt (SHA-256). Bewusst nur im Speicher:
+        # PDF-Inhalte werden nicht dauerhaft gespeichert (siehe Datenschutz-Hinweis der GUI)
+        self.result_cache_size = 4      # Anzahl zwischengespeicherter Dokumente
+        self._result_cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
     
-    def process_pdf(self, pdf_path: str) -> Dict[str, Any]:
+    def process_pdf(self, pdf_path: str, keep_page_texts: bool = True) -> Dict[str, Any]:
         """
         Hauptmethode zur PDF-Verarbeitung
         
         Args:
             pdf_path: Pfad zur PDF-Datei
+            keep_page_texts: Seitentexte in page_texts behalten (sonst nur Zählwerte;
+                der Text steht ohnehin vollständig in full_text)
             
         Returns:
             Dict mit Textinhalt, Metadaten und Analyse-Ergebnissen
@@ -48,18 +132,56 @@ class PDFProcessor:
             if not pdf_file.suffix.lower() == '.pdf':
                 raise ValueError(f"Datei ist keine PDF: {pdf_path}")
             
+            # Fingerabdruck einmal berechnen: für file_info und als Cache-Key
+            try:
+                file_hash = self.compute_file_hash(pdf_path)
+            except OSError as e:
+                self.logger.debug("Datei-Hash nicht berechenbar: %s", str(e))
+                file_hash = None
+            
+            # Identischer Inhalt wurde bereits verarbeitet?
+            cache_key = self._get_result_cache_key(file_hash, keep_page_texts)
+            cached = self._result_cache_get(cache_key, pdf_file)
+            if cached is not None:
+                self.logger.info("✅ PDF-Ergebnis aus Cache (identischer Dateiinhalt)")
+                return cached
+            
             # PDF lesen und Text extrahieren
-            reader = PdfReader(pdf_path)
-            extraction_result = self._extract_text_from_pdf(reader, pdf_file)
+            extraction_result = None
+            if self.use_pymupdf:
+                try:
+                    with pymupdf.open(pdf_path) as doc:
+                        extraction_result = self._extract_text_with_pymupdf(doc, pdf_file)
+                except Exception as e:
+                    self.logger.warning("⚠️ PyMuPDF konnte PDF nicht öffnen: %s", str(e))
+                
+                if extraction_result is not None and not extraction_result['success']:
+                    self.logger.warning("⚠️ %s", extraction_result['error'])
+                    extraction_result = None
+                
+                if extraction_result is None:
+                    self.logger.info("↩️ Nutze pypdf als Fallback")
+            
+            if extraction_result is None:
+                with self._open_pypdf(pdf_path) as reader:
+                    extraction_result = self._extract_text_from_pdf(reader, pdf_file)
             
             if not extraction_result['success']:
                 return extraction_result
             
+            extraction_result['file_info']['sha256'] = file_hash
+            
+            if not keep_page_texts:
+                # Seitentexte sind nach dem Zusammenfügen zu full_text nur noch Duplikate
+                for page_info in extraction_result['page_texts']:
+                    page_info.pop('text', None)
+            
             # Unicode-Analyse durchführen
             unicode_analysis = self._analyze_unicode_characters(extraction_result['full_text'])
             
-            # Text bereinigen für weitere Verarbeitung
-            cleaned_text = self._clean_text(extraction_result['full_text'])
+            # Text bereinigen für weitere Verarbeitung (Scan-Ergebnis der Unicode-Analyse wiederverwenden)
+            cleaned_text = self._clean_text(extraction_result['full_text'],
+                                            unicode_analysis['total_invisible_count'] > 0)
             
             # Finale Ergebnisse zusammenstellen
             result = {
@@ -74,6 +196,8 @@ class PDFProcessor:
                 'processing_timestamp': extraction_result['processing_timestamp']
             }
             
+            self._result_cache_set(cache_key, result)
+            
             self.logger.info("✅ PDF-Verarbeitung erfolgreich abgeschlossen")
             return result
             
@@ -87,68 +211,130 @@ class PDFProcessor:
                 'cleaned_text': None
             }
     
-    def _extract_text_from_pdf(self, reader: PdfReader, pdf_file: Path) -> Dict[str, Any]:
-        """Extrahiert Text aus PDF"""
-        import time
+    def _get_result_cache_key(self, file_hash: Optional[str], keep_page_texts: bool) -> Optional[str]:
+        """Cache-Key aus Dateiinhalt und Optionen, die das Ergebnis beeinflussen (None: kein Cache)"""
+        if self.result_cache_size <= 0 or file_hash is None:
+            return None
         
-        try:
-            # Datei-Informationen sammeln
-            file_info = {
-                'filename': pdf_file.name,
-                'file_size_bytes': pdf_file.stat().st_size,
-                'file_size_mb': round(pdf_file.stat().st_size / (1024*1024), 2),
-                'num_pages': len(reader.pages)
-            }
+        backend = 'pymupdf' if self.use_pymupdf else 'pypdf'
+        # invisible_chars ist zur Laufzeit änderbar und bestimmt unicode_analysis und cleaned_text
+        chars_digest = hashlib.sha256(repr(tuple(self.invisible_chars.items())).encode('utf-8')).hexdigest()[:16]
+        return f"{file_hash}:{backend}:{int(keep_page_texts)}:{chars_digest}"
+    
+    def _result_cache_get(self, key: Optional[str], pdf_file: Path) -> Optional[Dict[str, Any]]:
+        """Liest gecachtes Ergebnis; Dateiname wird auf den aktuellen Pfad gesetzt"""
+        if key is None or key not in self._result_cache:
+            return None
+        
+        self._result_cache.move_to_end(key)
+        cached = self._result_cache[key]
+        
+        # Flache Kopie, damit der Cache-Eintrag unverändert bleibt
+        result = dict(cached)
+        result['file_info'] = dict(cached['file_info'], filename=pdf_file.name)
+        return result
+    
+    def _result_cache_set(self, key: Optional[str], result: Dict[str, Any]):
+        """Speichert Ergebnis (LRU, höchstens result_cache_size Einträge)"""
+        if key is None:
+            return
+        
+        self._result_cache[key] = result
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > self.result_cache_size:
+            self._result_cache.popitem(last=False)
+    
+    def get_metadata(self, pdf_path: str) -> Dict[str, Any]:
+        """
+        Liest nur die PDF-Metadaten (Info-Dictionary), ohne Seiten zu laden oder Text zu extrahieren
+        
+        Args:
+            pdf_path: Pfad zur PDF-Datei
             
-            # PDF-Metadaten extrahieren
-            metadata = reader.metadata or {}
-            pdf_metadata = {
-                'title': getattr(metadata, 'title', None),
-                'author': getattr(metadata, 'author', None),
-                'creator': getattr(metadata, 'creator', None),
-                'producer': getattr(metadata, 'producer', None),
-                'creation_date': str(getattr(metadata, 'creation_date', None)),
-                'modification_date': str(getattr(metadata, 'modification_date', None))
-            }
+        Returns:
+            Dict mit title, author, creator, producer, creation_date, modification_date
+        """
+        if self.use_pymupdf:
+            try:
+                with pymupdf.open(pdf_path) as doc:
+                    return self._read_pymupdf_metadata(doc)
+            except Exception as e:
+                self.logger.debug("PyMuPDF-Metadaten nicht lesbar, nutze pypdf: %s", str(e))
+        
+        with self._open_pypdf(pdf_path) as reader:
+            return self._read_pypdf_metadata(reader)
+    
+    @staticmethod
+    @contextmanager
+    def _open_pypdf(pdf_path: str) -> Iterator[PdfReader]:
+        """
+        PdfReader über mmap: pypdf liest bei Pfadangabe die ganze Datei in ein BytesIO,
+        über mmap werden nur die tatsächlich gelesenen Bereiche eingelagert.
+        (PyMuPDF liest bei Pfadangabe ohnehin bedarfsweise.)
+        """
+        with open(pdf_path, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Leere Dateien lassen sich nicht mappen - pypdf meldet den eigentlichen Fehler
+                yield PdfReader(f)
+                return
             
-            # Text von allen Seiten extrahieren
-            full_text = ""
-            page_texts = []
+            with mm:
+                yield PdfReader(mm)
+    
+    def _read_pypdf_metadata(self, reader: PdfReader) -> Dict[str, Any]:
+        """PDF-Metadaten aus pypdf (greift nicht auf reader.pages zu)"""
+        metadata = reader.metadata or {}
+        return {
+            'title': getattr(metadata, 'title', None),
+            'author': getattr(metadata, 'author', None),
+            'creator': getattr(metadata, 'creator', None),
+            'producer': getattr(metadata, 'producer', None),
+            'creation_date': str(getattr(metadata, 'creation_date', None)),
+            'modification_date': str(getattr(metadata, 'modification_date', None))
+        }
+    
+    def _read_pymupdf_metadata(self, doc: Any) -> Dict[str, Any]:
+        """PDF-Metadaten aus PyMuPDF (leere Strings für fehlende Felder → None, Datum wie bei pypdf)"""
+        metadata = doc.metadata or {}
+        return {
+            'title': metadata.get('title') or None,
+            'author': metadata.get('author') or None,
+            'creator': metadata.get('creator') or None,
+            'producer': metadata.get('producer') or None,
+            'creation_date': _format_pdf_date(metadata.get('creationDate')),
+            'modification_date': _format_pdf_date(metadata.get('modDate'))
+        }
+    
+    def _extract_text_from_pdf(self, reader: PdfReader, pdf_file: Path) -> Dict[str, Any]:
+        """Extrahiert Text aus PDF (pypdf)"""
+        try:
+            pdf_metadata = self._read_pypdf_metadata(reader)
             
-            for page_num, page in enumerate(reader.pages, 1):
-                self.logger.debug("Verarbeite Seite %d/%d", page_num, len(reader.pages))
-                
-                try:
-                    page_text = page.extract_text()
-                    page_info = {
-                        'page_number': page_num,
-                        'text': page_text,
-                        'char_count': len(page_text),
-                        'word_count': len(page_text.split()) if page_text else 0,
-                        'line_count': page_text.count('\n') if page_text else 0
-                    }
-                    page_texts.append(page_info)
-                    full_text += page_text + "\n\n"  # Seitentrenner
-                    
-                except Exception as e:
-                    self.logger.warning("⚠️ Fehler bei Seite %d: %s", page_num, str(e))
-                    page_texts.append({
-                        'page_number': page_num,
-                        'text': "",
-                        'char_count': 0,
-                        'word_count': 0,
-                        'line_count': 0,
-                        'error': str(e)
-                    })
+            page_extractors = (page.extract_text for page in reader.pages)
+            return self._extract_pages(pdf_file, len(reader.pages), pdf_metadata,
+                                       self._iter_page_results(page_extractors))
             
+        except Exception as e:
             return {
-                'success': True,
-                'file_info': file_info,
-                'pdf_metadata': pdf_metadata,
-                'full_text': full_text,
-                'page_texts': page_texts,
-                'processing_timestamp': time.time()
+                'success': False,
+                'error': f"Text-Extraktion fehlgeschlagen: {str(e)}"
             }
+    
+    def _extract_text_with_pymupdf(self, doc: Any, pdf_file: Path) -> Dict[str, Any]:
+        """Extrahiert Text aus PDF (PyMuPDF)"""
+        try:
+            pdf_metadata = self._read_pymupdf_metadata(doc)
+            
+            page_results = None
+            workers = self._extraction_worker_count(doc.page_count)
+            if workers >= 2:  # Ein einzelner Worker-Prozess wäre nur Overhead
+                page_results = self._extract_pages_parallel(pdf_file, doc.page_count, workers)
+            if page_results is None:
+                page_results = self._iter_page_results(page.get_text for page in doc)
+            
+            return self._extract_pages(pdf_file, doc.page_count, pdf_metadata, page_results)
             
         except Exception as e:
             return {
@@ -156,6 +342,92 @@ class PDFProcessor:
                 'error': f"Text-Extraktion fehlgeschlagen: {str(e)}"
             }
     
+    def _extraction_worker_count(self, num_pages: int) -> int:
+        """Anzahl Worker-Prozesse für die Seiten-Extraktion (je Worker mindestens parallel_min_pages Seiten)"""
+        if not self.parallel_extraction:
+            return 1
+        return max(1, min(self.max_extraction_workers, num_pages // self.parallel_min_pages))
+    
+    def _extract_pages_parallel(self, pdf_file: Path, num_pages: int,
+                                workers: int) -> Optional[List[Tuple[str, Optional[str]]]]:
+        """Verteilt zusammenhängende Seitenbereiche auf Worker-Prozesse (None bei Fehler)"""
+        step = -(-num_pages // workers)
+        ranges = [(start, min(start + step, num_pages)) for start in range(0, num_pages, step)]
+        
+        try:
+            with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+                futures = [executor.submit(_extract_page_range, str(pdf_file), start, stop)
+                           for start, stop in ranges]
+                # In Seitenreihenfolge zusammenführen
+                return [page_result for future in futures for page_result in future.result()]
+                
+        except (BrokenProcessPool, OSError, RuntimeError) as e:
+            self.logger.warning("⚠️ Parallele Extraktion nicht möglich (%s) - extrahiere seriell", str(e))
+            return None
+    
+    def _iter_page_results(self, page_extractors: Iterable[Callable[[], str]]) -> Iterator[Tuple[str, Optional[str]]]:
+        """Führt Seiten-Extraktoren aus; liefert (Text, Fehler) pro Seite"""
+        for extract_page_text in page_extractors:
+            try:
+                yield extract_page_text(), None
+            except Exception as e:
+                yield "", str(e)
+    
+    def _extract_pages(self, pdf_file: Path, num_pages: int, pdf_metadata: Dict[str, Any],
+                       page_results: Iterable[Tuple[str, Optional[str]]]) -> Dict[str, Any]:
+        """Sammelt Seitentexte und Datei-Informationen (backend-unabhängig)"""
+        import time
+        
+        # Datei-Informationen sammeln (ein stat-Aufruf)
+        file_size = pdf_file.stat().st_size
+        file_info = {
+            'filename': pdf_file.name,
+            'file_size_bytes': file_size,
+            'file_size_mb': round(file_size / (1024*1024), 2),
+            'num_pages': num_pages
+        }
+        
+        # Text von allen Seiten extrahieren (Teile sammeln, einmal zusammenfügen)
+        text_parts = []
+        page_texts = []
+        
+        for page_num, (page_text, error) in enumerate(page_results, 1):
+            self.logger.debug("Verarbeite Seite %d/%d", page_num, num_pages)
+            
+            if error is None:
+                page_info = {
+                    'page_number': page_num,
+                    'text': page_text,
+                    'char_count': len(page_text),
+                    # split() ist der schnellste Wortzähler in CPython (schneller als Regex-Zählung)
+                    'word_count': len(page_text.split()),
+                    'line_count': page_text.count('\n')
+                }
+                page_texts.append(page_info)
+                if page_text:
+                    text_parts.append(page_text)
+                text_parts.append("\n\n")  # Seitentrenner
+                
+            else:
+                self.logger.warning("⚠️ Fehler bei Seite %d: %s", page_num, error)
+                page_texts.append({
+                    'page_number': page_num,
+                    'text': "",
+                    'char_count': 0,
+                    'word_count': 0,
+                    'line_count': 0,
+                    'error': error
+                })
+        
+        return {
+            'success': True,
+            'file_info': file_info,
+            'pdf_metadata': pdf_metadata,
+            'full_text': "".join(text_parts),
+            'page_texts': page_texts,
+            'processing_timestamp': time.time()
+        }
+    
     def _analyze_unicode_characters(self, text: str) -> Dict[str, Any]:
         """Analysiert unsichtbare und verdächtige Unicode-Zeichen"""
         
@@ -169,24 +441,24 @@ class PDFProcessor:
             'invisibility_ratio': 0.0
         }
         
-        if not text:
+        tables = self._char_tables()
+        
+        # Sauberer Text (Normalfall): ein Regex-Scan ohne Treffer, Nullergebnis
+        if not text or tables.suspicious_re.search(text) is None:
             return analysis_result
         
-        # Analysiere bekannte unsichtbare Zeichen
-        for char, name in self.invisible_chars.items():
-            count = text.count(char)
+        # Ein Durchlauf (Regex-Scan in C), Treffer werden in C gezählt - kein Python-Code pro Zeichen
+        counts = Counter(tables.suspicious_re.findall(text))
+        private_use_count = sum(counts.values())
+        
+        # Bekannte unsichtbare Zeichen in fester Reihenfolge übernehmen
+        for char, name in tables.items:
+            count = counts.get(char, 0)
             if count > 0:
+                private_use_count -= count  # Rest sind Private Use Area Zeichen (U+E000-U+F8FF)
                 analysis_result['invisible_characters_found'][name] = count
                 # Speichere erste 10 Positionen für Debugging
-                positions = [i for i, c in enumerate(text) if c == char]
-                analysis_result['character_positions'][name] = positions[:10]
-        
-        # Prüfe auf Private Use Area Zeichen (U+E000-U+F8FF)
-        private_use_count = 0
-        for char in text:
-            code_point = ord(char)
-            if 0xE000 <= code_point <= 0xF8FF:
-                private_use_count += 1
+                analysis_result['character_positions'][name] = self._find_positions(text, char, 10)
         
         if private_use_count > 0:
             analysis_result['private_use_area_count'] = private_use_count
@@ -212,26 +484,42 @@ class PDFProcessor:
         
         return analysis_result
     
-    def _clean_text(self, text: str) -> str:
-        """Bereinigt Text von unsichtbaren Zeichen für die Analyse"""
+    def _char_tables(self) -> _CharTables:
+        """Scan-Strukturen zum aktuellen invisible_chars (Tupel-Bau pro Aufruf ist vernachlässigbar)"""
+        return _build_char_tables(tuple(self.invisible_chars.items()))
+    
+    @staticmethod
+    def _find_positions(text: str, char: str, limit: int) -> List[int]:
+        """Erste `limit` Positionen von char (str.find statt Vergleich pro Zeichen)"""
+        positions = []
+        index = text.find(char)
+        while index != -1 and len(positions) < limit:
+            positions.append(index)
+            index = text.find(char, index + 1)
+        return positions
+    
+    def _clean_text(self, text: str, has_suspicious_chars: Optional[bool] = None) -> str:
+        """
+        Bereinigt Text von unsichtbaren Zeichen für die Analyse
+        
+        Args:
+            text: Zu bereinigender Text
+            has_suspicious_chars: Ob unsichtbare/PUA-Zeichen enthalten sind, falls schon bekannt
+                (z.B. aus _analyze_unicode_characters); None: selbst prüfen
+        """
         if not text:
             return ""
         
-        cleaned_text = text
-        
-        # Entferne bekannte unsichtbare Zeichen
-        for char in self.invisible_chars.keys():
-            cleaned_text = cleaned_text.replace(char, '')
+        # Entferne bekannte unsichtbare Zeichen und Private Use Area Zeichen (ein Durchlauf).
+        # translate kopiert immer den ganzen Text - bei sauberem Text reicht der schnellere Such-Scan
+        tables = self._char_tables()
+        if has_suspicious_chars is None:
+            has_suspicious_chars = tables.suspicious_re.search(text) is not None
+        cleaned_text = text.translate(tables.strip_table) if has_suspicious_chars else text
         
-        # Entferne Private Use Area Zeichen
-        cleaned_text = ''.join(char for char in cleaned_text 
-                              if not (0xE000 <= ord(char) <= 0xF8FF))
-        
-        # Normalisiere Whitespace
-        cleaned_text = re.sub(r'\s+', ' ', cleaned_text)  # Multiple Spaces → Single Space
-        cleaned_text = re.sub(r'\n\s*\n', '\n\n', cleaned_text)  # Multiple Newlines → Double Newline
-        
-        return cleaned_text.strip()
+        # Normalisiere Whitespace: Whitespace-Folgen (inkl. Zeilenumbrüche) → Single Space,
+        # ohne Rand-Whitespace. split/join entspricht re.sub(r'\s+', ' ').strip(), ist aber schneller
+        return ' '.join(cleaned_text.split())
     
     def _calculate_text_statistics(self, text: str) -> Dict[str, Any]:
         """Berechnet grundlegende Textstatistiken"""
@@ -251,11 +539,12 @@ class PDFProcessor:
         total_words = len(words)
         
         # Sätze zählen (vereinfacht)
-        sentence_endings = re.findall(r'[.!?]+', text)
-        total_sentences = len(sentence_endings)
+        total_sentences = len(_SENTENCE_END_RE.findall(text))
         
         # Durchschnittswerte berechnen
-        avg_word_length = sum(len(word.strip('.,!?;:')) for word in words) / total_words if total_words > 0 else 0
+        # Wortlängen ohne Rand-Satzzeichen: map() statt Generator (kein Python-Frame pro Wort)
+        word_chars = sum(map(len, map(str.strip, words, repeat('.,!?;:'))))
+        avg_word_length = word_chars / total_words if total_words > 0 else 0
         avg_sentence_length = total_words / total_sentences if total_sentences > 0 else 0
         
         # Geschätzte Lesezeit (200 Wörter/Minute)
@@ -270,6 +559,25 @@ class PDFProcessor:
             'estimated_reading_time_minutes': round(reading_time, 1)
         }
     
+    @staticmethod
+    def compute_file_hash(pdf_path: str) -> str:
+        """
+        Berechnet SHA-256 der Datei über mmap (keine Kopie der Datei im Speicher)
+        
+        Args:
+            pdf_path: Pfad zur Datei
+            
+        Returns:
+            Hex-Digest des Dateiinhalts
+        """
+        with open(pdf_path, 'rb') as f:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return hashlib.sha256(mm).hexdigest()
+            except ValueError:
+                # Leere Dateien lassen sich nicht mappen
+                return hashlib.sha256(b'').hexdigest()
+    
     def get_text_sample(self, text: str, max_length: int = 500) -> str:
         """Gibt einen Textausschnitt für Vorschau zurück"""
         if not text:
@@ -285,3 +593,32 @@ class PDFProcessor:
             truncated = truncated[:last_space]
         
         return truncated + "..."
+
+_worker_processor: Optional[PDFProcessor] = None
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> List[Tuple[str, Optional[str]]]:
+    """Worker-Funktion: extrahiert die Seiten [start, stop) mit PyMuPDF; (Text, Fehler) pro Seite"""
+    results = []
+    with pymupdf.open(pdf_path) as doc:
+        for page_index in range(start, stop):
+            try:
+                results.append((doc[page_index].get_text(), None))
+            except Exception as e:
+                results.append(("", str(e)))
+    return results
+
+def process_pdf_file(pdf_path: str, keep_page_texts: bool = True) -> Dict[str, Any]:
+    """
+    Picklebarer Einstiegspunkt für ProcessPoolExecutor (eine Instanz pro Worker-Prozess)
+    
+    Args:
+        pdf_path: Pfad zur PDF-Datei
+        keep_page_texts: siehe PDFProcessor.process_pdf
+        
+    Returns:
+        Ergebnis von PDFProcessor.process_pdf
+    """
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = PDFProcessor()
+    return _worker_processor.process_pdf(pdf_path, keep_page_texts)
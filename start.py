@@ -2,6 +2,7 @@
 import sys
 import os
 import logging
+import importlib.util
 from pathlib import Path
 
 # Logging konfigurieren
@@ -35,19 +36,25 @@ def check_dependencies():
     missing_packages = []
     
     for import_name, package_name in required_packages:
+        # find_spec prüft nur die Verfügbarkeit; importiert wird erst beim ersten Gebrauch
+        # (google.genai zieht beim Import u.a. HTTP- und Protobuf-Stacks nach)
         try:
-            __import__(import_name)
-            logger.info("✅ %s verfügbar", package_name)
+            available = importlib.util.find_spec(import_name) is not None
         except ImportError:
+            # Übergeordnetes Paket (z.B. google) fehlt
+            available = False
+        
+        if available:
+            logger.info("✅ %s verfügbar", package_name)
+        else:
             missing_packages.append(package_name)
             logger.error("❌ %s fehlt", package_name)
     
-    # Prüfe Standard-Bibliotheken
-    standard_libs = ['tkinter', 'threading', 'json', 'logging', 'pathlib']
+    # Prüfe Standard-Bibliotheken (find_spec führt den Modul-Code nicht aus;
+    # _tkinter ist die C-Erweiterung, die ohne installiertes Tk fehlt)
+    standard_libs = ['tkinter', '_tkinter', 'threading', 'json', 'logging', 'pathlib']
     for lib in standard_libs:
-        try:
-            __import__(lib)
-        except ImportError:
+        if importlib.util.find_spec(lib) is None:
             logger.error("❌ Standard-Bibliothek '%s' nicht verfügbar", lib)
             return False
     